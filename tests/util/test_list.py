@@ -7,6 +7,7 @@
 :License: MIT
 """
 
+import numpy
 import unittest
 from wc_utils.util.list import (is_sorted, transpose, difference, det_dedupe, det_find_dupes,
     elements_to_str, get_count_limited_class, det_count_elements, dict_by_class)
@@ -24,6 +25,18 @@ class TestListUtilities(unittest.TestCase):
         self.assertTrue(is_sorted([1, 2, 3], le_cmp=lambda x, y: x <= y))
         self.assertFalse(is_sorted([2, 1, 3], le_cmp=lambda x, y: x <= y))
 
+        # vectorized comparison of numeric arrays and long numeric lists
+        self.assertTrue(is_sorted(numpy.array([1., 2., 2., 3.])))
+        self.assertFalse(is_sorted(numpy.array([1, 3, 2])))
+        self.assertTrue(is_sorted(numpy.array([])))
+        self.assertTrue(is_sorted(list(range(100))))
+        self.assertFalse(is_sorted(list(range(100)) + [0]))
+        self.assertTrue(is_sorted([float(i) for i in range(100)]))
+        self.assertFalse(is_sorted([float(i) for i in range(100)] + [float('nan')]))
+        self.assertFalse(is_sorted([2 ** 70] + list(range(100))))
+        with self.assertRaises(TypeError):
+            is_sorted(list(range(100)) + ['a'])
+
     def test_transpose(self):
         lst = [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
         t_lst = [[1, 4, 7], [2, 5, 8], [3, 6, 9]]
@@ -74,6 +87,13 @@ class TestListUtilities(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "the number of members of 'classes' named 'A' must be"):
             get_count_limited_class([A, B, A], 'A', 0, 1)
 
+        # stop at the first match beyond max, even for an unbounded iterator
+        def endless_As():
+            while True:
+                yield A
+        with self.assertRaisesRegex(ValueError, r"must be in \[0, 2\], but it is more than 2"):
+            get_count_limited_class(endless_As(), 'A', 0, 2)
+
         # change name of B to 'A'
         B.__name__ = 'A'
         with self.assertRaisesRegex(ValueError,
@@ -9,17 +9,19 @@
 from dataclasses import dataclass
 import datetime
 import math
+import mock
 import numpy as np
 import os
 import pickle
 import random
 import shutil
 import tempfile
+import typing
 import unittest
 
 from wc_utils.util.misc import (most_qual_cls_name, round_direct, OrderableNone, quote, isclass,
                                 isclass_by_name, obj_to_str, as_dict, internet_connected,
-                                geometric_iterator, DFSMAcceptor, EnhancedDataClass)
+                                geometric_iterator, geometric_array, DFSMAcceptor, EnhancedDataClass)
 from wc_utils.util.stats import ExponentialMovingAverage
 
 
@@ -81,6 +83,10 @@ class TestMisc(unittest.TestCase):
         self.assertEqual(most_qual_cls_name(ExponentialMovingAverage),
                          'wc_utils.util.stats.ExponentialMovingAverage')
 
+        cls = type('Cls', (object, ), {})
+        cls.__qualname__ = 'RenamedCls'
+        self.assertEqual(most_qual_cls_name(cls), 'tests.util.test_misc.RenamedCls')
+
         try:
             # Fully qualified class names are available for Python >= 3.3.
             hasattr(self, '__qualname__')
@@ -165,6 +171,16 @@ class TestMisc(unittest.TestCase):
         self.assertIn('a2: 3', str_rep)
         self.assertIn('not defined', obj_to_str(a, ['x']))
 
+        # values are converted with `str` rather than `format`
+        class Value(object):
+            def __str__(self):
+                return 'str'
+
+            def __format__(self, format_spec):
+                return 'format'
+        a.a1 = Value()
+        self.assertIn('a1: str', obj_to_str(a, ['a1']))
+
     def test_as_dict(self):
         A = self.A
         a = A('test_a1')
@@ -182,8 +198,41 @@ class TestMisc(unittest.TestCase):
         with self.assertRaises(ValueError) as context:
             as_dict(c)
 
+        # shared objects are represented wherever they occur
+        class E(object):
+            ATTRIBUTES = ['e1', 'e2']
+        e = E()
+        e.e1 = e.e2 = a
+        self.assertEqual(as_dict(e), {'e1': {'a1': 'test_a1', 'a2': 3}, 'e2': {'a1': 'test_a1', 'a2': 3}})
+
+        # deep nesting doesn't overflow the stack
+        e_root = e_leaf = E()
+        for _ in range(10000):
+            e_leaf.e1 = E()
+            e_leaf.e2 = None
+            e_leaf = e_leaf.e1
+        e_leaf.e1 = e_leaf.e2 = 1
+        d = as_dict(e_root)
+        for _ in range(10000):
+            d = d['e1']
+        self.assertEqual(d, {'e1': 1, 'e2': 1})
+
+        # cycles are detected
+        e.e2 = e
+        with self.assertRaisesRegex(ValueError, "cycle through attribute 'e2' of E"):
+            as_dict(e)
+
     def test_internet_connected(self):
         self.assertEqual(internet_connected(), internet_connected())
+        self.assertEqual(internet_connected(max_age=0.), internet_connected())
+
+        # results are cached for each timeout
+        with mock.patch('socket.create_connection', side_effect=OSError):
+            self.assertFalse(internet_connected(timeout=2.))
+        with mock.patch('socket.create_connection'):
+            self.assertFalse(internet_connected(timeout=2.))
+            self.assertTrue(internet_connected(timeout=3.))
+            self.assertTrue(internet_connected(timeout=2., max_age=0.))
 
     def test_geometric_iterator(self):
         self.assertEqual([2, 4, 8], list(geometric_iterator(2, 10, 2)))
@@ -198,6 +247,18 @@ class TestMisc(unittest.TestCase):
         with self.assertRaisesRegexp(ValueError, '1 < factor is required'):
             next(geometric_iterator(.1, 0.3, .6))
 
+    def test_geometric_array(self):
+        for args in [(2, 10, 2), (1E-5, 0.1, 10), (0.1, 0.3, 3), (1, 1, 2), (1, 1000, 1.01), (3, 1E6, 1.5),
+                     (1E-300, 1E300, 10)]:
+            np.testing.assert_allclose(geometric_array(*args), list(geometric_iterator(*args)), rtol=1E-12)
+        self.assertIsInstance(geometric_array(2, 10, 2), np.ndarray)
+        with self.assertRaisesRegexp(ValueError, '0 < min is required'):
+            geometric_array(0, 0.3, 3)
+        with self.assertRaisesRegexp(ValueError, 'min <= max is required'):
+            geometric_array(1, 0.3, 3)
+        with self.assertRaisesRegexp(ValueError, '1 < factor is required'):
+            geometric_array(.1, 0.3, .6)
+
 
 class TestDFSMAcceptor(unittest.TestCase):
 
@@ -213,6 +274,11 @@ class TestDFSMAcceptor(unittest.TestCase):
         self.assertEqual(DFSMAcceptor.ACCEPT, dfsm_acceptor.run(['do exercise', 'do exercise']))
         self.assertEqual(DFSMAcceptor.FAIL, dfsm_acceptor.run(['do exercise']))
         self.assertEqual(DFSMAcceptor.FAIL, dfsm_acceptor.run([7, 'do exercise']))
+        self.assertEqual('start', dfsm_acceptor.get_state())
+        self.assertEqual(DFSMAcceptor.FAIL, dfsm_acceptor.run(['do exercise'] * 3))
+        self.assertEqual('done 2', dfsm_acceptor.get_state())
+        self.assertEqual(DFSMAcceptor.FAIL, dfsm_acceptor.exec_transition('do exercise'))
+        self.assertEqual('done 2', dfsm_acceptor.get_state())
 
         with self.assertRaisesRegex(ValueError, 'already a transition from'):
             DFSMAcceptor('s', 'e', [('s', 'm', 0), ('s', 'm', 'e')])
@@ -220,6 +286,37 @@ class TestDFSMAcceptor(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, 'no transitions available from start state'):
             DFSMAcceptor('s', 'e', [('f', 'm1', 0), ('e', 'm1', 'f')])
 
+    def test_minimize(self):
+        transitions = [
+            ('s', 'a', 'x1'),
+            ('s', 'b', 'x2'),
+            ('x1', 'c', 'e'),
+            ('x2', 'c', 'e'),
+            ('e', 'c', 'e'),
+            ('s', 'd', 'trap'),
+            ('trap', 'c', 'trap 2'),
+            ('unreachable', 'c', 'e'),
+        ]
+        dfsm_acceptor = DFSMAcceptor('s', 'e', transitions)
+        minimized_dfsm_acceptor = DFSMAcceptor('s', 'e', transitions, minimize=True)
+        self.assertEqual(minimized_dfsm_acceptor.transitions_dict, {
+            's': {'a': 'x1', 'b': 'x1'},
+            'x1': {'c': 'e'},
+            'e': {'c': 'e'},
+        })
+        for messages in [['a', 'c'], ['b', 'c', 'c'], ['d', 'c'], ['c'], [], ['a'], ['b', 'b']]:
+            self.assertEqual(dfsm_acceptor.run(messages), minimized_dfsm_acceptor.run(messages))
+
+        # the start state is preserved even if the accepting state is unreachable
+        dfsm_acceptor = DFSMAcceptor('s', 'e', [('s', 'a', 't'), ('t', 'a', 's')], minimize=True)
+        self.assertEqual(dfsm_acceptor.transitions_dict, {'s': {}})
+        self.assertEqual(DFSMAcceptor.FAIL, dfsm_acceptor.run(['a']))
+
+        # cycles through the accepting state are preserved
+        dfsm_acceptor = DFSMAcceptor('s', 'e', [('s', 'a', 'e'), ('e', 'a', 's')], minimize=True)
+        self.assertEqual(DFSMAcceptor.ACCEPT, dfsm_acceptor.run(['a', 'a', 'a']))
+        self.assertEqual(DFSMAcceptor.FAIL, dfsm_acceptor.run(['a', 'a']))
+
 
 @dataclass
 class InnerClassFiltersPickle(EnhancedDataClass):
@@ -328,6 +425,10 @@ class TestEnhancedDataClass(unittest.TestCase):
         with self.assertRaisesRegex(TypeError, "an int"):
             InnerClassDoesNotFilterPickle('x')
 
+        # attributes that aren't fields aren't validated
+        inner_class_does_not_filter_pickle._cache = 'x'
+        self.assertEqual(inner_class_does_not_filter_pickle._cache, 'x')
+
     def test_validate_dataclass_type(self):
 
         o = InnerClassDoesNotFilterPickle(1, 'x')
@@ -355,6 +456,41 @@ class TestEnhancedDataClass(unittest.TestCase):
         with self.assertRaises(ValueError):
             o.validate_dataclass_type('bad name')
 
+    def test_field_meta_cached_per_class(self):
+        @dataclass
+        class Parent(EnhancedDataClass):
+            i: int
+
+        @dataclass
+        class Child(Parent):
+            s: str = None
+
+        Parent(1)
+        self.assertEqual(list(Parent._get_field_meta()), ['i'])
+        self.assertEqual(list(Child._get_field_meta()), ['i', 's'])
+        self.assertEqual(Child._get_field_meta()['i'][1:], (int, 'int', 'an', False))
+        self.assertEqual(Child._get_field_meta()['s'][1:], (str, 'str', 'a', True))
+        with self.assertRaisesRegex(TypeError, "a str"):
+            Child(1, 2)
+
+    def test_validate_type_hints(self):
+        @dataclass
+        class TypeHints(EnhancedDataClass):
+            o: typing.Optional[int]
+            l: typing.List[int] = None
+            a: typing.Any = None
+            f: 'float' = 1.
+
+        o = TypeHints(None, [1], 'x', 2)
+        self.assertEqual(o.f, 2.)
+        TypeHints(3)
+        with self.assertRaisesRegex(TypeError, "o \\('x'\\) must be an int or NoneType"):
+            TypeHints('x')
+        with self.assertRaisesRegex(TypeError, "a list"):
+            TypeHints(1, (1, ))
+        with self.assertRaisesRegex(TypeError, "a float"):
+            TypeHints(1, f='x')
+
     def test_validate_dataclass_types(self):
 
         o = InnerClassDoesNotFilterPickle(1, 'hi')
@@ -404,6 +540,19 @@ class TestEnhancedDataClass(unittest.TestCase):
         # test that filtered attribute is not set
         prepared_to_pickle = self.inner_class_filters_pickle.prepare_to_pickle()
         self.assertEquals(prepared_to_pickle.bad, None)
+        self.assertIsNot(self.inner_class_filters_pickle.bad, None)
+
+        # test that other attributes are copied
+        @dataclass
+        class ClassWithList(EnhancedDataClass):
+            l: list
+            o: InnerClassFiltersPickle = None
+        instance = ClassWithList([[1]], self.inner_class_filters_pickle)
+        prepared_to_pickle = instance.prepare_to_pickle()
+        self.assertEqual(prepared_to_pickle.l, [[1]])
+        self.assertIsNot(prepared_to_pickle.l[0], instance.l[0])
+        self.assertIsNot(prepared_to_pickle.o, instance.o)
+        self.assertEqual(prepared_to_pickle.o.bad, None)
 
     def test_semantically_equal(self):
         # test the default semantically_equal
@@ -10,7 +10,8 @@ from copy import deepcopy
 from matplotlib import pyplot
 from numpy import random
 from scipy.stats import binom, poisson
-from wc_utils.util.rand import RandomState, RandomStateManager, validate_random_state, InvalidRandomStateException
+from wc_utils.util.rand import (RandomState, RandomStateManager, validate_random_state, validate_bit_generator_state,
+                                InvalidRandomStateException)
 import numpy as np
 import unittest
 import math
@@ -34,10 +35,10 @@ class TestRandomState(unittest.TestCase):
         random_state = RandomState()
         x = 3.5
 
-        for method in ['binomial', 'midpoint', 'poisson', 'quadratic']:
+        for method in ['binomial', 'binomial_bits', 'midpoint', 'poisson', 'quadratic']:
             round = random_state.round(x, method=method)
             self.assertEqual(round, int(round))
-            if method in ['binomial', 'midpoint', 'quadratic']:
+            if method in ['binomial', 'binomial_bits', 'midpoint', 'quadratic']:
                 self.assertIn(round, [math.floor(x), math.ceil(x)])
 
         with self.assertRaises(Exception) as context:
@@ -58,6 +59,63 @@ class TestRandomState(unittest.TestCase):
         self.assertGreater(obs_avg, min)
         self.assertLess(obs_avg, max)
 
+    def test_round_binomial_array(self):
+        random_state = RandomState()
+        self.assertEqual(random_state.round_binomial(np.array([3., 4.])).tolist(), [3, 4])
+
+        avg = 3.4
+        samples = 1000
+        rounds = random_state.round(np.full((2, samples), avg))
+        self.assertEqual(rounds.shape, (2, samples))
+        self.assertEqual(rounds.dtype, np.int64)
+        self.assertTrue(np.all((rounds == 3) | (rounds == 4)))
+        obs_avg = np.mean(rounds)
+        min = np.floor(avg) + binom.ppf(0.001, n=2 * samples, p=avg % 1) / (2 * samples)
+        max = np.floor(avg) + binom.ppf(0.999, n=2 * samples, p=avg % 1) / (2 * samples)
+        self.assertGreater(obs_avg, min)
+        self.assertLess(obs_avg, max)
+
+    def test_round_binomial_bits(self):
+        random_state = RandomState()
+        self.assertEqual(random_state.round_binomial_bits(3), 3)
+        self.assertEqual(random_state.round_binomial_bits(-2.), -2)
+        self.assertIsInstance(random_state.round_binomial_bits(3.4), int)
+        self.assertEqual(random_state.round_binomial_bits(np.array([3., -2.])).tolist(), [3, -2])
+
+        avg = 3.4
+        samples = 1000
+        for rounds in [[random_state.round_binomial_bits(avg) for i in range(samples)],
+                       random_state.round(np.full(samples, avg), method='binomial_bits')]:
+            self.assertTrue(np.all(np.isin(rounds, [3, 4])))
+            obs_avg = np.mean(rounds)
+            min = np.floor(avg) + binom.ppf(0.001, n=samples, p=avg % 1) / samples
+            max = np.floor(avg) + binom.ppf(0.999, n=samples, p=avg % 1) / samples
+            self.assertGreater(obs_avg, min)
+            self.assertLess(obs_avg, max)
+
+    def test_round_bfloat16(self):
+        random_state = RandomState(seed=1)
+
+        # bfloat16 values are not changed
+        x = np.array([0., 1., -1., 1.5, 2.**-100, np.inf, -np.inf], dtype=np.float32)
+        np.testing.assert_array_equal(random_state.round_bfloat16(x), x)
+        self.assertTrue(np.isnan(random_state.round_bfloat16(np.nan)))
+        self.assertIsInstance(random_state.round_bfloat16(1.), np.float32)
+
+        # other values are rounded to one of the two closest bfloat16 values
+        lower = np.float32(1.)
+        upper = np.float32(1. + 2.**-7)
+        x = np.float32(1. + 0.25 * 2.**-7)
+        samples = random_state.round_bfloat16(np.full((3, 1001), x))
+        self.assertEqual(samples.shape, (3, 1001))
+        self.assertEqual(samples.dtype, np.float32)
+        self.assertTrue(np.all((samples == lower) | (samples == upper)))
+        self.assertLess(abs(np.mean(samples == upper) - 0.25), 0.05)
+
+        samples = random_state.round_bfloat16(np.full(1001, -x))
+        self.assertTrue(np.all((samples == -lower) | (samples == -upper)))
+        self.assertLess(abs(np.mean(samples == -upper) - 0.25), 0.05)
+
     def test_round_midpoint(self):
         random_state = RandomState()
 
@@ -72,6 +130,20 @@ class TestRandomState(unittest.TestCase):
         self.assertGreaterEqual(obs_avg, min)
         self.assertLessEqual(obs_avg, max)
 
+    def test_round_midpoint_array(self):
+        random_state = RandomState()
+        self.assertEqual(random_state.round_midpoint(np.array([3.4, 3.6, -0.6, 2.])).tolist(), [3, 4, -1, 2])
+
+        samples = 2000
+        rounds = random_state.round(np.full(samples, 3.5), method='midpoint')
+        self.assertEqual(rounds.dtype, np.int64)
+        self.assertTrue(np.all((rounds == 3) | (rounds == 4)))
+        obs_avg = np.mean(rounds)
+        min = 3 + binom.ppf(0.0001, n=samples, p=0.5) / samples
+        max = 3 + binom.ppf(0.9999, n=samples, p=0.5) / samples
+        self.assertGreaterEqual(obs_avg, min)
+        self.assertLessEqual(obs_avg, max)
+
     def test_round_poisson(self):
         random_state = RandomState()
         avg = 3.4
@@ -110,15 +182,47 @@ class TestRandomState(unittest.TestCase):
         obs_avg = np.mean([random_state.round_quadratic(s) for s in samples])
         self.assertLess(abs(obs_avg - 0.5), 0.1)
 
+    def test_round_quadratic_array(self):
+        random_state = RandomState()
+        nsamples = 50000
+        for avg in [3.25, 3.75]:
+            rounds = random_state.round(np.full(nsamples, avg), method='quadratic')
+            self.assertEqual(rounds.dtype, np.int64)
+            self.assertTrue(np.all((rounds == np.floor(avg)) | (rounds == np.ceil(avg))))
+        self.assertLess(np.mean(random_state.round(np.full(nsamples, 0.2), method='quadratic')),
+                        np.mean(random_state.round(np.full(nsamples, 0.8), method='quadratic')))
+        obs_avg = np.mean(random_state.round_quadratic(np.random.random_sample(nsamples)))
+        self.assertLess(abs(obs_avg - 0.5), 0.1)
+
+    def test_std(self):
+        random_state = RandomState()
+        samples = random_state.std(size=(10000, ))
+        self.assertEqual(samples.shape, (10000, ))
+        self.assertTrue(np.all((0. <= samples) & (samples <= 1.)))
+        self.assertLess(abs(np.mean(samples) - 0.5), 0.02)
+
+        # the samples are the same as those drawn with two calls to random_sample
+        for size in [None, 5, (2, 3)]:
+            random_state_1 = RandomState(seed=1)
+            random_state_2 = RandomState(seed=1)
+            np.testing.assert_equal(random_state_1.std(size),
+                                    (random_state_2.random_sample(size) + random_state_2.random_sample(size)) / 2)
+
     def test_ltd(self):
         random_state = RandomState()
         self.assertGreaterEqual(random_state.ltd(), 0.)
         self.assertLessEqual(random_state.ltd(), 1.)
+        samples = random_state.ltd(size=10000)
+        self.assertTrue(np.all((0. <= samples) & (samples <= 1.)))
+        self.assertLess(abs(np.mean(samples) - 1 / 3), 0.02)
 
     def test_rtd(self):
         random_state = RandomState()
         self.assertGreaterEqual(random_state.rtd(), 0.)
         self.assertLessEqual(random_state.rtd(), 1.)
+        samples = random_state.rtd(size=10000)
+        self.assertTrue(np.all((0. <= samples) & (samples <= 1.)))
+        self.assertLess(abs(np.mean(samples) - 2 / 3), 0.02)
 
     def test_plot_rounding(self):
         random_state = RandomState()
@@ -149,9 +253,38 @@ class TestRandomStateManager(unittest.TestCase):
         np.testing.assert_equal(r1.get_state(), r2.get_state())
         self.assertEqual(r1, r2)
 
+    def test_bit_generator(self):
+        try:
+            RandomStateManager.initialize(seed=123, bit_generator=np.random.PCG64)
+            r1 = RandomStateManager.instance()
+            self.assertTrue(validate_bit_generator_state(r1.get_state(legacy=False)))
+            samples = r1.random_sample(3)
+
+            RandomStateManager.initialize(seed=123, bit_generator=np.random.PCG64)
+            r2 = RandomStateManager.instance()
+            self.assertIsNot(r2, r1)
+            np.testing.assert_equal(r2.random_sample(3), samples)
+            self.assertIn(r2.round(3.5), [3, 4])
+        finally:
+            RandomStateManager.initialize(seed=123)
+
+        r3 = RandomStateManager.instance()
+        self.assertTrue(validate_random_state(r3.get_state()))
+        np.testing.assert_equal(r3.get_state()[1], RandomState(seed=123).get_state()[1])
+
 
 class TestValidateRandomState(unittest.TestCase):
 
+    def test_validate_bit_generator_state(self):
+        state = RandomState(np.random.PCG64(1)).get_state(legacy=False)
+        self.assertTrue(validate_bit_generator_state(state))
+
+        self.assertRaises(InvalidRandomStateException, validate_bit_generator_state, random.get_state())
+        self.assertRaises(InvalidRandomStateException, validate_bit_generator_state, dict(state, bit_generator='xxx'))
+        self.assertRaises(InvalidRandomStateException, validate_bit_generator_state,
+                          dict(state, bit_generator='SeedSequence'))
+        self.assertRaises(InvalidRandomStateException, validate_bit_generator_state, dict(state, state=None))
+
     def test_validate_random_state(self):
         r1 = random.get_state()
         self.assertTrue(validate_random_state(r1))
@@ -167,6 +300,14 @@ class TestValidateRandomState(unittest.TestCase):
         r3[1] = [1]
         self.assertRaises(InvalidRandomStateException, validate_random_state, r3)
 
+        r3 = deepcopy(r2)
+        r3[1] = [1.] * 624
+        self.assertRaises(InvalidRandomStateException, validate_random_state, r3)
+
+        r3 = deepcopy(r2)
+        r3[1] = list(r2[1])
+        self.assertTrue(validate_random_state(r3))
+
         r3 = deepcopy(r2)
         r3[2] = 1.2
         self.assertRaises(InvalidRandomStateException, validate_random_state, r3)
@@ -9,6 +9,7 @@
 from wc_utils.util import stats
 import numpy
 import numpy.testing
+import pickle
 import unittest
 
 
@@ -37,6 +38,9 @@ class TestStats(unittest.TestCase):
 
         exp = stats.ExponentialMovingAverage(1., alpha=0.5)
         self.assertEqual(exp.get_ema(), 1.)
+        self.assertEqual(exp.one_minus_alpha, 0.5)
+        self.assertFalse(hasattr(exp, '__dict__'))
+        self.assertEqual(pickle.loads(pickle.dumps(exp)), exp)
 
         exp2 = stats.ExponentialMovingAverage(1., alpha=0.5)
         self.assertEqual(exp, exp2)
@@ -71,6 +75,22 @@ class TestStats(unittest.TestCase):
         for i in range(10):
             self.assertEqual(x, ema.add_value(x))
 
+    def test_exponential_moving_average_add_values(self):
+        for alpha in [0., 0.001, 0.5, 0.99, 1.]:
+            values = numpy.random.rand(2000) - 0.5
+            ema = stats.ExponentialMovingAverage(1., alpha=alpha)
+            ema_2 = stats.ExponentialMovingAverage(1., alpha=alpha)
+            averages = ema_2.add_values(values)
+            self.assertEqual(averages.shape, (2000,))
+            for value, average in zip(values, averages):
+                self.assertAlmostEqual(ema.add_value(value), average, delta=1e-12)
+            self.assertEqual(ema_2.get_ema(), averages[-1])
+
+        ema = stats.ExponentialMovingAverage(1., alpha=0.5)
+        numpy.testing.assert_array_equal(ema.add_values([2, 3]), [1.5, 2.25])
+        self.assertEqual(ema.add_values([]).size, 0)
+        self.assertEqual(ema.get_ema(), 2.25)
+
     def test_weighted_mean(self):
         self.assertEqual(stats.weighted_mean([2, 1], [1, 1]), 1.5)
         self.assertEqual(stats.weighted_mean([2, 1], [0, 1]), 1.0)
@@ -110,6 +130,61 @@ class TestStats(unittest.TestCase):
         numpy.testing.assert_equal(stats.weighted_percentile([1, 2, 3, 0], [10, 1, 20, numpy.nan], 0, ignore_nan=False), numpy.nan)
         numpy.testing.assert_equal(stats.weighted_percentile([1, 2, 3, 0], [10, 1, 20, numpy.nan], 100, ignore_nan=False), numpy.nan)
 
+    def test_weighted_percentile_out_of_range(self):
+        # the percentile is validated for both short lists, which are sorted, and long lists, which are partitioned
+        for n in [10, 2 * stats._MAX_SORTED_PERCENTILE_SIZE]:
+            values = numpy.arange(n)
+            for percentile in [-1, 150, numpy.nan]:
+                with self.assertRaisesRegex(ValueError, '`percentile` must satisfy'):
+                    stats.weighted_percentile(values, numpy.ones(n), percentile)
+                with self.assertRaisesRegex(ValueError, '`percentiles` must satisfy'):
+                    stats.weighted_percentiles(values, numpy.ones(n), [50, percentile])
+
+    def test_weighted_percentile_large(self):
+        # large lists of values are partitioned rather than sorted
+        n = 10000
+        for values, weights in [
+            (numpy.random.rand(n), numpy.random.rand(n)),
+            (numpy.random.randint(0, 20, n), numpy.random.randint(0, 4, n)),
+            (numpy.random.randint(0, 5, n), numpy.ones(n)),
+        ]:
+            for percentile in [0, 1, 10, 25, 50, 75, 99, 100]:
+                self.assertEqual(stats.weighted_percentile(values, weights, percentile),
+                                 stats.weighted_percentiles(values, weights, percentile)[()])
+
+        self.assertEqual(stats.weighted_percentile(numpy.arange(n), numpy.ones(n), 50), (n - 1) / 2)
+
+    def test_weighted_percentile_large_tie(self):
+        # the cumulative weight equals the target at the last value below a previous pivot
+        n = 2 * (stats._MAX_SORTED_PERCENTILE_SIZE + 1)
+        values = [1.] * (n // 2) + [2.] * (n // 2)
+        self.assertEqual(stats.weighted_percentile(values, numpy.ones(n), 50), 1.5)
+        self.assertEqual(stats.weighted_percentiles(values, numpy.ones(n), 50), 1.5)
+
+        for k in [2, 3, 5, 8]:
+            values = numpy.arange(n) % k
+            for percentile in [10, 25, 50, 75, 90]:
+                self.assertEqual(stats.weighted_percentile(values, numpy.ones(n), percentile),
+                                 stats.weighted_percentiles(values, numpy.ones(n), percentile)[()])
+
+    def test_weighted_percentiles(self):
+        numpy.testing.assert_array_equal(stats.weighted_percentiles([2, 1, 3], [1, 1, 1], [0, 20, 50, 80, 100]),
+                                         [1., 1., 2., 3., 3.])
+        numpy.testing.assert_array_equal(stats.weighted_percentiles([2, 1], [1, 1], [[25, 50], [75, 100]]),
+                                         [[1., 1.5], [2., 2.]])
+
+        values = numpy.random.rand(100)
+        weights = numpy.random.rand(100)
+        percentiles = [10, 25, 50, 75, 90]
+        numpy.testing.assert_array_equal(stats.weighted_percentiles(values, weights, percentiles),
+                                         [stats.weighted_percentile(values, weights, p) for p in percentiles])
+
+        numpy.testing.assert_array_equal(stats.weighted_percentiles([2, 1], [0, 0], [0, 100]), [numpy.nan, numpy.nan])
+        numpy.testing.assert_array_equal(stats.weighted_percentiles([2, 2, 1], [1, 2, 0], [0, 50, 100]), [2., 2., 2.])
+        numpy.testing.assert_array_equal(stats.weighted_percentiles([1, 2, 3, 0], [10, 1, 20, numpy.nan], [0, 100],
+                                                                    ignore_nan=False),
+                                         [numpy.nan, numpy.nan])
+
     def test_weighted_median(self):
         self.assertEqual(stats.weighted_median([2, 1, 3], [1, 1, 1]), numpy.median([2., 1., 3.]))
         self.assertEqual(stats.weighted_median([2, 1, 3, 4], [1, 1, 1, 1]), numpy.median([2., 1., 3., 4.]))
@@ -113,6 +113,11 @@ class TestStringUtils(unittest.TestCase):
 
         self.assertEqual(string.find_nth('123232323', '1234', 1), -1)
 
+        # `end` may be a float
+        self.assertEqual(string.find_nth('123232323', '3', 3, end=6.), -1)
+        self.assertEqual(string.find_nth('123232323', '3', 3, end=6.5), 6)
+        self.assertEqual(string.find_nth('123232323', '23', 3, end=7.), 5)
+
         with self.assertRaisesRegex(ValueError, 'sep cannot be empty'):
             string.find_nth('123232323', '', 1)
 
@@ -142,6 +147,11 @@ class TestStringUtils(unittest.TestCase):
 
         self.assertEqual(string.rfind_nth('123232323', '1234', 1), -1)
 
+        # `end` may be a float
+        self.assertEqual(string.rfind_nth('123232323', '3', 1, end=6.), 4)
+        self.assertEqual(string.rfind_nth('123232323', '3', 1, end=6.5), 6)
+        self.assertEqual(string.rfind_nth('123232323', '23', 2, end=7.), 3)
+
         with self.assertRaisesRegex(ValueError, 'sep cannot be empty'):
             string.rfind_nth('123232323', '', 1)
 
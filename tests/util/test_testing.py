@@ -7,15 +7,34 @@
 """
 
 from wc_utils.util import testing
+import objsize
 import unittest
 
 
 class TestingTestCase(unittest.TestCase):
     def test_memory(self):
         testing.assert_memory_less(1, 100)
-        with self.assertRaisesRegex(ValueError, 'memory is greater than or equal to '):
+        with self.assertRaisesRegex(ValueError, 'which is not less than the limit of '):
             testing.assert_memory_less(1000 * [1], 100, exclusive=True)
 
         testing.assert_memory_less_equal(1, 100)
-        with self.assertRaisesRegex(ValueError, 'memory is greater than '):
+        with self.assertRaisesRegex(ValueError, 'which exceeds the limit of '):
             testing.assert_memory_less_equal(1000 * [1], 100, exclusive=True)
+
+        obj = [[i] for i in range(1000)]
+        size = objsize.get_deep_size(obj)
+        testing.assert_memory_less_equal(obj, size)
+        testing.assert_memory_less(obj, size + 1)
+        with self.assertRaisesRegex(ValueError, 'which exceeds the limit of '):
+            testing.assert_memory_less_equal(obj, size - 1)
+
+    def test_get_deep_size_up_to(self):
+        obj = [[i] for i in range(1000)]
+        self.assertEqual(testing._get_deep_size_up_to(obj, float('inf'), False), objsize.get_deep_size(obj))
+        self.assertEqual(testing._get_deep_size_up_to(obj[:10], float('inf'), True),
+                         objsize.get_exclusive_deep_size(obj[:10]))
+
+        # the traversal stops once the size is reached
+        partial_size = testing._get_deep_size_up_to(obj, 10000, False)
+        self.assertGreaterEqual(partial_size, 10000)
+        self.assertLess(partial_size, objsize.get_deep_size(obj))
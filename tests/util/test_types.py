@@ -28,6 +28,9 @@ class TestCastToBuiltins(unittest.TestCase):
         self.assertEqual(cast_to_builtins(2.0), 2.0)
         self.assertEqual(cast_to_builtins(np.float64(2.0)), 2.0)
         self.assertEqual(cast_to_builtins(np.float64(np.nan)).__class__, float('nan').__class__)
+        self.assertEqual(cast_to_builtins(np.uint16(3)).__class__, int)
+        self.assertEqual(cast_to_builtins(np.bool_(True)).__class__, bool)
+        self.assertEqual(cast_to_builtins([np.float32(0.5), None]), [0.5, None])
 
     def test_recursive(self):
         obj = SetAttrClass(
@@ -72,6 +75,12 @@ class TestAssertValueEqual(unittest.TestCase):
         self.assertRaises(TypesUtilAssertionError, lambda: assert_value_equal([1, 2, 3], [1, 2]))
         assert_value_not_equal([1, 2, 3], [1, 2])
 
+        assert_value_equal(list(range(10000)), list(reversed(range(10000))))
+        assert_value_equal([1, 'a', None, 1.], [None, 1., 'a', 1], check_type=True)
+        self.assertRaises(TypesUtilAssertionError, lambda: assert_value_equal([1, 'a'], ['a', 1.], check_type=True))
+        assert_value_equal([1, float('nan')], [float('nan'), 1])
+        assert_value_equal([(1, 2), 3], [3, [2, 1]])
+
     def test_dict(self):
         assert_value_equal({'y': 2, 'x': 1}, {'x': 1, 'y': 2})
         assert_value_equal(SetAttrClass(x=1, y=2), {'y': 2, 'x': 1})
@@ -83,6 +92,9 @@ class TestAssertValueEqual(unittest.TestCase):
         assert_value_equal(2.0, 2.0)
         assert_value_equal(np.float64(2.0), 2.0)
         assert_value_equal(float('nan'), np.nan)
+        assert_value_equal(np.float32('nan'), float('nan'))
+        self.assertRaises(TypesUtilAssertionError, lambda: assert_value_equal(float('nan'), 1.))
+        self.assertRaises(TypesUtilAssertionError, lambda: assert_value_equal('nan', float('nan')))
         assert_value_equal(float(2.0), np.float64(2.0))
 
     def test_recursive(self):
@@ -133,6 +145,9 @@ class TestGetSuperclasses(unittest.TestCase):
         self.assertEqual(get_superclasses(Child11, immediate_only=True), (Parent1, ))
         self.assertEqual(get_superclasses(Child11), (Parent1, GrandParent, object, ))
 
+        # test de-duplication
+        self.assertEqual(get_superclasses(Leaf), (Left, Right, Root, object, ))
+
 
 class SetAttrClass(object):
 
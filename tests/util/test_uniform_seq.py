@@ -7,10 +7,12 @@
 """
 
 from decimal import Decimal
+import mock
 import unittest
 import sys
 
 from wc_utils.config.core import get_config
+from wc_utils.util import uniform_seq
 from wc_utils.util.uniform_seq import UniformSequence
 UNIFORM_SEQ_PRECISION = get_config()['wc_utils']['misc']['uniform_seq_precision']
 
@@ -44,6 +46,7 @@ class TestUniformSequence(unittest.TestCase):
 
         us = UniformSequence(0, 1)
         self.assertEqual(us.__iter__(), us)
+        self.assertFalse(hasattr(us, '__dict__'))
 
         bad_steps = [0, float('nan'), float('inf'), -float('inf')]
         for bad_step in bad_steps:
@@ -62,9 +65,46 @@ class TestUniformSequence(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "precision in step=.* exceeds UNIFORM_SEQ_PRECISION threshold"):
             UniformSequence(0, '0.123456789')
 
+    def test_next_float(self):
+        # next_float computes values with integers while Decimal arithmetic would be exact
+        for start, step in [(0, '.1'), ('-2.5', '.03'), ('1E+3', '-7'), ('-1E+6', 1), ('.001', '25')]:
+            us = UniformSequence(start, step)
+            us_2 = UniformSequence(start, step)
+            for num_steps in [0, 10**5, 10**6 - 5]:
+                us._num_steps = us_2._num_steps = num_steps
+                for _ in range(10):
+                    self.assertEqual(us.next_float(), float(us_2.__next__()))
+
+    def test_next_floats(self):
+        for start, step in [(0, '.1'), ('-2.5', '.03'), ('1E+3', '-7'), ('-1E+6', 1), ('1E-30', '1E-30')]:
+            us = UniformSequence(start, step)
+            us_2 = UniformSequence(start, step)
+            for num_steps in [0, 10**5, 10**6 - 5]:
+                us._num_steps = us_2._num_steps = num_steps
+                for n in [0, 1, 10]:
+                    values = us.next_floats(n)
+                    self.assertEqual(values.shape, (n, ))
+                    self.assertEqual(values.tolist(), [us_2.next_float() for _ in range(n)])
+                    self.assertEqual(us._num_steps, us_2._num_steps)
+
+    def test_next_floats_high_precision(self):
+        # the numerators of these sequences exceed 2 ** 53, and those of the last sequence exceed the int64 range
+        for precision in [17, 19]:
+            with mock.patch.object(uniform_seq, 'UNIFORM_SEQ_PRECISION', precision), \
+                    mock.patch.object(uniform_seq, '_MAX_EXACT_INT', 10 ** precision - 1):
+                for start, step in [('0.1', '1E-17'), ('1.2345678901234567', '1E-16'), ('0.95', '1E-17')]:
+                    us = UniformSequence(start, step)
+                    us_2 = UniformSequence(start, step)
+                    self.assertEqual(us.next_floats(1000).tolist(), [us_2.next_float() for _ in range(1000)])
+
     def test_truncate(self):
         not_too_much_precision = float('1.' + '1' * UNIFORM_SEQ_PRECISION)
         self.assertEqual(UniformSequence.truncate(not_too_much_precision), str(not_too_much_precision))
         with self.assertRaisesRegex(StopIteration, 'UniformSequence: truncation error:'):
             too_much_precision = float('1.' + '1' * (UNIFORM_SEQ_PRECISION + 1))
             UniformSequence.truncate(too_much_precision)
+
+        self.assertEqual(UniformSequence.truncate(0.), '0.' + '0' * UNIFORM_SEQ_PRECISION)
+        self.assertEqual(UniformSequence.truncate(-0.), '-0.' + '0' * UNIFORM_SEQ_PRECISION)
+        self.assertEqual(UniformSequence.truncate(2), '2.' + '0' * UNIFORM_SEQ_PRECISION)
+        self.assertEqual(UniformSequence.truncate(2.), '2.' + '0' * UNIFORM_SEQ_PRECISION)
@@ -7,8 +7,11 @@
 """
 
 from wc_utils.util import units
+import gc
+import mock
 import pint
 import unittest
+import weakref
 
 
 class TestUnits(unittest.TestCase):
@@ -23,9 +26,21 @@ class TestUnits(unittest.TestCase):
         with self.assertRaises(pint.UndefinedUnitError):
             ureg.parse_expression('NOT_A_UNIT')
 
+    def test_get_unit_registry_extra_filenames(self):
+        ureg = units.get_unit_registry(extra_filenames=[units.DEFAULT_UNIT_DEFINITION_FILENAME])
+        self.assertEqual(str(ureg.parse_expression('s^(-1)').units), '1 / second')
+        self.assertEqual(str(ureg.parse_expression('M').units), 'molar')
+
     def test_unit_registry(self):
         ureg = units.unit_registry
         self.assertIsInstance(ureg, pint.UnitRegistry)
+        self.assertIs(units.unit_registry, ureg)
+
+        from wc_utils.util.units import unit_registry
+        self.assertIs(unit_registry, ureg)
+
+        with self.assertRaises(AttributeError):
+            units.not_an_attribute
 
         quantity = ureg.parse_expression('s^(-1)')
         self.assertEqual(str(quantity.units), '1 / second')
@@ -76,3 +91,20 @@ class TestUnits(unittest.TestCase):
         self.assertFalse(units.are_units_equivalent(
             registry1.parse_units('molecule'),
             registry1.parse_units('dimensionless')))
+
+    def test_parse_expression_cache(self):
+        registry = pint.UnitRegistry()
+        expr = units._parse_expression(registry, 'g / l')
+        self.assertEqual(expr, registry.parse_expression('g / l'))
+        self.assertIs(units._parse_expression(registry, 'g / l'), expr)
+
+        with mock.patch.object(units, '_MAX_PARSED_EXPRESSIONS', 1):
+            self.assertEqual(units._parse_expression(registry, 'g'), registry.parse_expression('g'))
+            self.assertEqual(list(registry._parsed_expressions.keys()), ['g'])
+
+        # the cache doesn't keep the registry alive
+        self.assertTrue(units.are_units_equivalent(registry.parse_units('g / l'), registry.parse_units('mg / ml')))
+        registry_ref = weakref.ref(registry)
+        del registry, expr
+        gc.collect()
+        self.assertIsNone(registry_ref())
@@ -101,6 +101,17 @@ class TestCore(unittest.TestCase):
         self.assertEqual(self.wk == wk, False)
         self.assertEqual(wk == self.wk, False)
 
+        self.assertEqual(Row([None, 'a']) == Row(['', 'a']), True)
+
+        # `nan` is unequal to itself, even when the same object is in both rows
+        nan = float('nan')
+        self.assertEqual(Row([nan]) == Row([nan]), False)
+        row = Row(['a', nan])
+        self.assertEqual(row == row, False)
+        self.assertEqual(Worksheet([row]) == Worksheet([row]), False)
+        wk = Workbook([('Ws', Worksheet([row]))])
+        self.assertEqual(wk == wk, False)
+
     def test_ne(self):
         wk = deepcopy(self.wk)
         self.assertEqual(self.wk != wk, False)
@@ -7,6 +7,8 @@
 :License: MIT
 """
 
+import operator
+
 
 class DictUtil(object):
     """ Dictionary utility methods """
@@ -99,7 +101,9 @@ class DictUtil(object):
         if d is None:
             return '{}'
         else:
-            return '{' + ', '.join('{!r}: {!r}'.format(key, d[key]) for key in sorted(d)) + '}'
+            # sort the items by key only, so that values are never compared
+            return '{' + ', '.join(f'{key!r}: {value!r}'
+                                   for key, value in sorted(d.items(), key=operator.itemgetter(0))) + '}'
 
     @staticmethod
     def filtered_dict(d, filter_keys):
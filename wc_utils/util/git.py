@@ -17,6 +17,7 @@ import git
 import github
 import itertools
 import os
+import weakref
 
 
 def get_repo(path='.', search_parent_directories=True):
@@ -54,6 +55,27 @@ def get_repo(path='.', search_parent_directories=True):
     return repo
 
 
+# map from each `git.Repo` to the root directory of its working tree
+_repo_roots = weakref.WeakKeyDictionary()
+
+
+def _get_repo_root(repo):
+    """ Get the root directory of a repository's working tree
+
+    Roots are cached for the lifetime of each repository object.
+
+    Args:
+        repo (:obj:`git.Repo`): a `GitPython` repository
+
+    Returns:
+        :obj:`Path`: the directory that contains the repository's `.git` directory
+    """
+    repo_root = _repo_roots.get(repo)
+    if repo_root is None:
+        repo_root = _repo_roots[repo] = Path(repo.git_dir).parent
+    return repo_root
+
+
 class RepoMetadataCollectionType(Enum):
     """ Type of Git repo being queried for metadata that's stored in a data file """
     DATA_REPO = auto()
@@ -103,9 +125,9 @@ def repo_suitability(repo, repo_type, data_file=None):
 
         # ensure that data_file exists in repo
         resolved_data_file = Path(data_file).expanduser().resolve()
-        repo_root = Path(repo.git_dir).parent
+        repo_root = _get_repo_root(repo)
         try:
-            resolved_data_file.relative_to(str(repo_root))
+            rel_data_file = resolved_data_file.relative_to(str(repo_root)).as_posix()
         except ValueError:
             raise ValueError("data_file '{}' must be in the repo that's in '{}'".format(
                 data_file, str(repo_root)))
@@ -121,8 +143,10 @@ def repo_suitability(repo, repo_type, data_file=None):
                     resolved_b_rawpath != resolved_data_file):
                     unsuitable_changes.append('modified path(s) are not data_file path')
 
+        # Git reports untracked files as POSIX paths relative to the repo root, so compare them
+        # with the data file's relative path as strings
         for untracked_file in repo.untracked_files:
-            if repo_root.joinpath(untracked_file) != resolved_data_file:
+            if untracked_file != rel_data_file:
                 unsuitable_changes.append("untracked file '{}' is not data file: '{}'".format(
                     repo_root.joinpath(untracked_file), resolved_data_file))
 
@@ -7,6 +7,11 @@
 :License: MIT
 """
 
+import collections
+import itertools
+import numpy
+import operator
+
 
 def is_sorted(lst, le_cmp=None):
     """ Check if a list is sorted
@@ -18,9 +23,20 @@ def is_sorted(lst, le_cmp=None):
     Returns
         :obj:`bool`: true if the list is sorted
     """
-    if le_cmp:
-        return all(le_cmp(a, b) for a, b in zip(lst[:-1], lst[1:]))
-    return all(a <= b for a, b in zip(lst[:-1], lst[1:]))
+    if not le_cmp:
+        # compare numeric arrays, and long lists of numbers of a single type, in one vectorized step
+        arr = None
+        if isinstance(lst, numpy.ndarray):
+            arr = lst
+        elif isinstance(lst, (list, tuple)) and len(lst) >= 64 and set(map(type, lst)) in ({int}, {float}):
+            arr = numpy.asarray(lst)
+        if arr is not None and arr.ndim == 1 and arr.dtype.kind in 'biuf':
+            return bool(numpy.all(arr[:-1] <= arr[1:]))
+
+        le_cmp = operator.le
+
+    # pair each element with its successor without copying `lst`
+    return all(map(le_cmp, lst, itertools.islice(lst, 1, None)))
 
 
 def transpose(lst):
@@ -79,13 +95,7 @@ def det_dedupe(l):
     Raises:
         `TypeError` if `l` contains an unhashable (mutable) type
     """
-    s = set()
-    t = []
-    for e in l:
-        if e not in s:
-            t.append(e)
-            s.add(e)
-    return t
+    return list(dict.fromkeys(l))
 
 
 def det_find_dupes(l):
@@ -107,11 +117,11 @@ def det_find_dupes(l):
     counts_to_2 = {}
     dupes = []
     for e in l:
-        if e not in counts_to_2:
-            counts_to_2[e] = 1
-        elif counts_to_2[e] == 1:
-            counts_to_2[e] += 1
-            dupes.append(e)
+        c = counts_to_2.get(e, 0)
+        if c < 2:
+            counts_to_2[e] = c + 1
+            if c == 1:
+                dupes.append(e)
     return dupes
 
 
@@ -136,15 +146,23 @@ def get_count_limited_class(classes, class_name, min=1, max=1):
     """
     if min > max:
         raise ValueError("min ({}) > max ({})".format(min, max))
-    matching_classes = [cls for cls in classes if cls.__name__ == class_name]
-    if len(matching_classes) < min or max < len(matching_classes):
+    # stop scanning `classes` as soon as more than `max` matches have been found
+    matching_classes = []
+    for cls in classes:
+        if cls.__name__ == class_name:
+            matching_classes.append(cls)
+            if max < len(matching_classes):
+                raise ValueError("the number of members of 'classes' named '{}' must be in [{}, {}], "
+                                 "but it is more than {}".format(class_name, min, max, max))
+    if len(matching_classes) < min:
         raise ValueError("the number of members of 'classes' named '{}' must be in [{}, {}], but it is {}".format(
             class_name, min, max, len(matching_classes)))
     # confirm that all elements in matching_classes are the same
-    unique_matching_classes = set(matching_classes)
-    if 1 < len(unique_matching_classes):
-        raise ValueError("'classes' should contain at most 1 class named '{}', but it contains {}".format(
-            class_name, len(unique_matching_classes)))
+    if 1 < len(matching_classes):
+        unique_matching_classes = set(matching_classes)
+        if 1 < len(unique_matching_classes):
+            raise ValueError("'classes' should contain at most 1 class named '{}', but it contains {}".format(
+                class_name, len(unique_matching_classes)))
     if matching_classes:
         return matching_classes[0]
     return None
@@ -164,14 +182,15 @@ def det_count_elements(l):
     Raises:
         `TypeError` if an element of `l` is an unhashable (mutable) type
     """
+    # dicts are ordered by the first occurrence of each element in `l`
     counts = {}
-    found = []
     for e in l:
-        if e not in counts:
-            counts[e] = 0
-            found.append(e)
-        counts[e] += 1
-    return [(e, counts[e]) for e in found]
+        c = counts.get(e)
+        if c is None:
+            counts[e] = 1
+        else:
+            counts[e] = c + 1
+    return list(counts.items())
 
 
 def elements_to_str(l):
@@ -183,7 +202,7 @@ def elements_to_str(l):
     Returns:
         :obj:`list`: a list containing each element of the iterator converted to a string
     """
-    return [str(e) for e in l]
+    return list(map(str, l))
 
 
 def dict_by_class(obj_list):
@@ -195,10 +214,7 @@ def dict_by_class(obj_list):
     Returns:
         :obj:`dict`: mapping from object class to list of objects of that class
     """
-    obj_dict = {}
+    obj_dict = collections.defaultdict(list)
     for obj in obj_list:
-        cls = obj.__class__
-        if cls not in obj_dict:
-            obj_dict[cls] = []
-        obj_dict[cls].append(obj)
-    return obj_dict
+        obj_dict[obj.__class__].append(obj)
+    return dict(obj_dict)
@@ -8,14 +8,18 @@
 """
 
 from fractions import Fraction
+import array
 import collections.abc
 import copy
 import dataclasses
+import itertools
 import math
+import numpy
 import os
 import pickle
 import socket
-import sys
+import time
+import typing
 
 
 def isclass(cls, cls_info):
@@ -44,12 +48,14 @@ def isclass_by_name(cls_name, cls_info):
         :obj:`bool`: True if one of the classes in `cls_info` has name `cls_name`.
     """
     if not isinstance(cls_info, tuple):
-        cls_info = (cls_info,)
+        return cls_name == most_qual_cls_name(cls_info)
 
-    for a_cls_info in cls_info:
+    # walk nested tuples with an explicit stack rather than recursion
+    stack = [cls_info]
+    while stack:
+        a_cls_info = stack.pop()
         if isinstance(a_cls_info, tuple):
-            if isclass_by_name(cls_name, a_cls_info):
-                return True
+            stack.extend(a_cls_info)
         elif cls_name == most_qual_cls_name(a_cls_info):
             return True
 
@@ -61,7 +67,6 @@ def most_qual_cls_name(obj):
 
     Since references to classes cannot be sent in messages that leave an address space,
     use the most qualified class name available to compare class values across address spaces.
-    Fully qualified class names are available for Python >= 3.3.
 
     Args:
         obj (:obj:`class`): an object, which may be a class.
@@ -73,11 +78,7 @@ def most_qual_cls_name(obj):
         cls = obj
     else:
         cls = obj.__class__
-
-    if (3, 3) <= sys.version_info:
-        return cls.__module__ + '.' + cls.__qualname__
-    else:
-        return cls.__module__ + '.' + cls.__name__  # pragma: no cover # old Python
+    return f'{cls.__module__}.{cls.__qualname__}'
 
 
 def round_direct(value, precision=2):
@@ -99,12 +100,13 @@ def round_direct(value, precision=2):
     Returns:
         str: `value` rounded to `precision` places, followed by a sign indicating rounding direction.
     """
-    if round(value, precision) == value:
-        return str(round(value, precision))
-    elif round(value, precision) < value:
-        return '{}+'.format(round(value, precision))
-    else:   # value < round(value, precision)
-        return '{}-'.format(round(value, precision))
+    rounded_value = round(value, precision)
+    if rounded_value == value:
+        return str(rounded_value)
+    elif rounded_value < value:
+        return f'{rounded_value}+'
+    else:   # value < rounded_value
+        return f'{rounded_value}-'
 
 
 def quote(s):
@@ -118,7 +120,7 @@ def quote(s):
     """
     s = str(s)
     if ' ' in s:
-        return "'{}'".format(s)
+        return f"'{s}'"
     else:
         return s
 
@@ -135,54 +137,93 @@ def obj_to_str(obj, attrs):
     """
     rv = ['\nClass: ' + obj.__class__.__name__]
     for attr in attrs:
-        if hasattr(obj, attr):
-            rv.append("{}: {}".format(attr, str(getattr(obj, attr))))
+        value = getattr(obj, attr, _UNDEFINED)
+        if value is _UNDEFINED:
+            rv.append(f"{attr}: --not defined--")
         else:
-            rv.append("{}: --not defined--".format(attr))
+            rv.append(f"{attr}: {str(value)}")
     return '\n'.join(rv)
 
 
+# sentinel for attributes that are not defined
+_UNDEFINED = object()
+
+
 def as_dict(obj):
     """ Provide a dictionary representation of `obj`
 
     `obj` must define an attribute called `ATTRIBUTES` which iterates over the attributes that
     should be included in the representation.
 
-    Recursively computes `as_dict()` on nested objects that define `ATTRIBUTES`. Warning: calling
-    `as_dict` on cyclic networks of objects will cause infinite recursion and stack overflow.
+    Also computes dictionary representations of nested objects that define `ATTRIBUTES`. Nested
+    objects are traversed iteratively, so deep nesting cannot overflow the stack.
 
     Returns:
         :obj:`dict`: a representation of `obj` mapping attribute names to values, nested for nested
             objects
 
     Raises:
-        :obj:`ValueError`: `obj` does not define an attribute called `ATTRIBUTES`
+        :obj:`ValueError`: `obj` does not define an attribute called `ATTRIBUTES`, or
+            `obj` contains itself through a cycle of nested objects
     """
     if not hasattr(obj, 'ATTRIBUTES'):
         raise ValueError('obj must define the attribute ATTRIBUTES')
     d = {}
-    for attr in obj.ATTRIBUTES:
-        contained_obj = getattr(obj, attr)
-        if hasattr(contained_obj, 'ATTRIBUTES'):
-            d[attr] = as_dict(contained_obj)
-        else:
-            d[attr] = getattr(obj, attr)
+    # depth-first traversal; each entry holds an object and the dict that represents it, or, with
+    # a dict of None, marks the end of the object's subtree
+    pending = [(obj, d)]
+    path = set()
+    while pending:
+        an_obj, a_dict = pending.pop()
+        if a_dict is None:
+            path.remove(id(an_obj))
+            continue
+        path.add(id(an_obj))
+        pending.append((an_obj, None))
+        for attr in an_obj.ATTRIBUTES:
+            contained_obj = getattr(an_obj, attr)
+            if hasattr(contained_obj, 'ATTRIBUTES'):
+                if id(contained_obj) in path:
+                    raise ValueError(f"cannot represent the cycle through attribute '{attr}' of "
+                                     f"{an_obj.__class__.__name__} as a dict")
+                a_dict[attr] = {}
+                pending.append((contained_obj, a_dict[attr]))
+            else:
+                a_dict[attr] = contained_obj
     return d
 
 
-def internet_connected():
+# map from timeout to the time, according to :obj:`time.monotonic`, and result of the last check for an
+# Internet connection with that timeout
+_internet_connected_cache = {}
+
+
+def internet_connected(timeout=1., max_age=30.):
     """ Determine whether the Internet is connected
 
+    Results are cached for `max_age` seconds for each `timeout` so that repeated checks don't each open a
+    connection.
+
+    Args:
+        timeout (:obj:`float`, optional): seconds to wait to connect
+        max_age (:obj:`float`, optional): seconds for which to reuse the result of a previous check
+
     Returns:
         :obj:`bool`: return `True` if the internet (actually www.google.com) is accessible, `False` otherwise
     """
+    now = time.monotonic()
+    cached = _internet_connected_cache.get(timeout)
+    if cached is not None and now - cached[0] < max_age:
+        return cached[1]
+
     try:
         # connect to the host -- tells us if the host is actually reachable
-        socket.create_connection(("www.google.com", 80))
-        return True
+        with socket.create_connection(("www.google.com", 80), timeout=timeout):
+            connected = True
     except OSError: # pragma: no cover
-        pass
-    return False    # pragma: no cover
+        connected = False
+    _internet_connected_cache[timeout] = (now, connected)
+    return connected
 
 
 class OrderableNoneType(object):
@@ -222,6 +263,68 @@ def geometric_iterator(min, max, factor):
     Returns:
         :obj:`iterator` of :obj:`float`: the geometic sequence
 
+    Raises:
+        :obj:`ValueError`: if `min` <= 0, or
+            if `max` < `min`, or
+            if `factor` <= 1
+    """
+    _validate_geometric_sequence(min, max, factor)
+    sequence_value = min
+    while sequence_value < max or math.isclose(sequence_value, max, rel_tol=1E-14):
+        yield sequence_value
+        sequence_value *= factor
+
+
+def geometric_array(min, max, factor):
+    """ Create a geometic sequence as an array
+
+    Vectorized alternative to :obj:`geometric_iterator` for long sequences. Contains the same elements as
+    :obj:`geometric_iterator`, which are computed by repeated multiplication with :obj:`numpy.cumprod`.
+
+    Args:
+        min (:obj:`float`): first and smallest element of the geometic sequence
+        max (:obj:`float`): largest element of the geometic sequence
+        factor (:obj:`float`): multiplicative factor between sequence entries
+
+    Returns:
+        :obj:`numpy.ndarray` of :obj:`float`: the geometic sequence
+
+    Raises:
+        :obj:`ValueError`: if `min` <= 0, or
+            if `max` < `min`, or
+            if `factor` <= 1
+    """
+    _validate_geometric_sequence(min, max, factor)
+
+    def in_sequence(value):
+        return value < max or math.isclose(value, max, rel_tol=1E-14)
+
+    # estimate the number of elements from the difference of the logarithms, which, unlike `max` / `min`,
+    # doesn't overflow
+    n = int(math.floor((math.log(max) - math.log(min)) / math.log(factor))) + 2
+    with numpy.errstate(over='ignore'):
+        while True:
+            factors = numpy.full(n, float(factor))
+            factors[0] = min
+            sequence = numpy.cumprod(factors)
+            if not in_sequence(sequence[-1]):
+                break
+            n += 1
+
+    # correct for rounding error in the logarithms
+    while not in_sequence(sequence[n - 1]):
+        n -= 1
+    return sequence[:n]
+
+
+def _validate_geometric_sequence(min, max, factor):
+    """ Validate the parameters of a geometic sequence
+
+    Args:
+        min (:obj:`float`): first and smallest element of the geometic sequence
+        max (:obj:`float`): largest element of the geometic sequence
+        factor (:obj:`float`): multiplicative factor between sequence entries
+
     Raises:
         :obj:`ValueError`: if `min` <= 0, or
             if `max` < `min`, or
@@ -233,10 +336,6 @@ def geometric_iterator(min, max, factor):
         raise ValueError(f'min = {min} and max = {max}; min <= max is required')
     if factor <= 1:
         raise ValueError(f'factor = {factor}; 1 < factor is required')
-    sequence_value = min
-    while sequence_value < max or math.isclose(sequence_value, max, rel_tol=1E-14):
-        yield sequence_value
-        sequence_value *= factor
 
 
 class DFSMAcceptor(object):
@@ -250,6 +349,12 @@ class DFSMAcceptor(object):
         accepting_state (:obj:`object`): a DFSM must be in this state to accept a message sequence
         transitions_dict (:obj:`dict`): transitions, a map state -> message -> next state
         state (:obj:`object`): a DFSM's current state
+        _states (:obj:`list`): all states, indexed by their integer ids
+        _state_ids (:obj:`dict`): map from state to integer id
+        _message_ids (:obj:`dict`): map from message to integer id
+        _table (:obj:`array.array`): dense transition table; the id of the next state after state
+            `i` receives message `j` is stored at `i * len(_message_ids) + j`, or -1 if there is
+            no such transition
     """
 
     # acceptance fails
@@ -257,13 +362,16 @@ class DFSMAcceptor(object):
     # acceptance succeeds
     ACCEPT = 'accept'
 
-    def __init__(self, start_state, accepting_state, transitions):
+    def __init__(self, start_state, accepting_state, transitions, minimize=False):
         """
         Args:
             start_state (:obj:`object`): a DFSM's start state
             accepting_state (:obj:`object`): a DFSM must be in this state to accept a message sequence
             transitions (:obj:`iterator` of `tuple`): transitions, an iterator of
                 (state, message, next state) tuples
+            minimize (:obj:`bool`, optional): if set, minimize the DFSM, which merges equivalent states
+                and removes states that are unreachable or cannot reach `accepting_state`; this
+                costs O(m n log n) for a DFSM with n states and m messages when it is constructed
 
         Raises:
             :obj:`ValueError`: if `transitions` contains redundant transitions, or if no transitions
@@ -276,13 +384,125 @@ class DFSMAcceptor(object):
             if state not in self.transitions_dict:
                 self.transitions_dict[state] = {}
             if transition_message in self.transitions_dict[state]:
-                raise ValueError("'{}' already a transition from '{}'".format(transition_message,
-                    state))
+                raise ValueError(f"'{transition_message}' already a transition from '{state}'")
             self.transitions_dict[state][transition_message] = new_state
         if start_state not in self.transitions_dict:
-            raise ValueError("no transitions available from start state '{}'".format(start_state))
+            raise ValueError(f"no transitions available from start state '{start_state}'")
+        self._build_table()
+        if minimize:
+            self._minimize()
         self.reset()
 
+    def _build_table(self):
+        """ Intern states and messages as integers and build the dense transition table from `transitions_dict`
+        """
+        self._states = []
+        self._state_ids = {}
+        self._message_ids = {}
+        for state in itertools.chain([self.start_state, self.accepting_state], self.transitions_dict):
+            if state not in self._state_ids:
+                self._state_ids[state] = len(self._states)
+                self._states.append(state)
+        for messages in self.transitions_dict.values():
+            for message, new_state in messages.items():
+                if message not in self._message_ids:
+                    self._message_ids[message] = len(self._message_ids)
+                if new_state not in self._state_ids:
+                    self._state_ids[new_state] = len(self._states)
+                    self._states.append(new_state)
+
+        n_messages = len(self._message_ids)
+        self._table = array.array('i', [-1]) * (len(self._states) * n_messages)
+        for state, messages in self.transitions_dict.items():
+            offset = self._state_ids[state] * n_messages
+            for message, new_state in messages.items():
+                self._table[offset + self._message_ids[message]] = self._state_ids[new_state]
+
+    def _minimize(self):
+        """ Minimize the DFSM with Hopcroft's algorithm, which costs O(m n log n) for a DFSM with n states
+        and m messages
+
+        Each set of equivalent states is replaced by its state with the smallest id, which preserves
+        `start_state` and `accepting_state`. Transitions into states from which `accepting_state`
+        cannot be reached are removed, so that they fail immediately.
+        """
+        table = self._table
+        n_messages = len(self._message_ids)
+        start_id = self._state_ids[self.start_state]
+        accepting_id = self._state_ids[self.accepting_state]
+
+        # find the states that are reachable from the start state
+        reachable = {start_id}
+        pending = [start_id]
+        while pending:
+            state_id = pending.pop()
+            for new_state_id in table[state_id * n_messages:(state_id + 1) * n_messages]:
+                if new_state_id >= 0 and new_state_id not in reachable:
+                    reachable.add(new_state_id)
+                    pending.append(new_state_id)
+
+        # complete the DFSM with a dead state, and index the transitions into each state
+        dead_id = len(self._states)
+        reachable.add(dead_id)
+        inverse = [collections.defaultdict(set) for _ in range(n_messages)]
+        for state_id in reachable:
+            for message_id in range(n_messages):
+                new_state_id = dead_id
+                if state_id != dead_id and table[state_id * n_messages + message_id] >= 0:
+                    new_state_id = table[state_id * n_messages + message_id]
+                inverse[message_id][new_state_id].add(state_id)
+
+        # refine the partition {accepting, non-accepting} until each block contains equivalent states; only
+        # the blocks that contain predecessors of a splitter are visited, and the smaller part of each split
+        # block becomes a new block
+        blocks = [block for block in (reachable & {accepting_id}, reachable - {accepting_id}) if block]
+        block_ids = {state_id: i_block for i_block, block in enumerate(blocks) for state_id in block}
+        work = {min(range(len(blocks)), key=lambda i_block: len(blocks[i_block]))}
+        while work:
+            splitter = list(blocks[work.pop()])
+            for message_id in range(n_messages):
+                # group the predecessors of the splitter by their blocks
+                touched = collections.defaultdict(set)
+                for state_id in splitter:
+                    for predecessor_id in inverse[message_id].get(state_id, ()):
+                        touched[block_ids[predecessor_id]].add(predecessor_id)
+
+                for i_block, inside in touched.items():
+                    block = blocks[i_block]
+                    if len(inside) == len(block):
+                        continue
+                    if len(inside) > len(block) - len(inside):
+                        inside = block - inside
+                    block -= inside
+                    i_new_block = len(blocks)
+                    blocks.append(inside)
+                    for state_id in inside:
+                        block_ids[state_id] = i_new_block
+                    # if the block is waiting to be a splitter, both parts must be; otherwise, splitting by
+                    # the smaller part suffices
+                    work.add(i_new_block)
+
+        # map each state to the representative of its block
+        representatives = {}
+        for block in blocks:
+            representative = min(block)
+            for state_id in block:
+                representatives[state_id] = representative
+        dead_rep = representatives[dead_id]
+
+        # rebuild the transitions among the representatives
+        messages = list(self._message_ids)
+        transitions_dict = {self.start_state: {}}
+        for state_id in sorted(set(representatives.values()) - {dead_rep}):
+            offset = state_id * n_messages
+            for message_id, message in enumerate(messages):
+                new_state_id = table[offset + message_id]
+                if new_state_id >= 0 and representatives[new_state_id] != dead_rep:
+                    transitions_dict.setdefault(self._states[state_id], {})[message] = \
+                        self._states[representatives[new_state_id]]
+        self.transitions_dict = transitions_dict
+        self._build_table()
+
     def reset(self):
         """ Reset a DFSM to it's start state
         """
@@ -303,9 +523,13 @@ class DFSMAcceptor(object):
             :obj:`object`: returns `DFSMAcceptor.FAIL` if `message` does not transition the DFSM to
                 another state; otherwise returns `None`
         """
-        if message not in self.transitions_dict[self.state]:
+        message_id = self._message_ids.get(message)
+        if message_id is None:
             return DFSMAcceptor.FAIL
-        self.state = self.transitions_dict[self.state][message]
+        new_state_id = self._table[self._state_ids[self.state] * len(self._message_ids) + message_id]
+        if new_state_id < 0:
+            return DFSMAcceptor.FAIL
+        self.state = self._states[new_state_id]
 
     def run(self, transition_messages):
         """ Execute one DFSM state transition
@@ -318,11 +542,20 @@ class DFSMAcceptor(object):
             :obj:`object`: returns `DFSMAcceptor.FAIL` if `transition_messages` do not transition the
                 DFSM to from its `start_state` to its `accepting_state`; otherwise returns `DFSMAcceptor.ACCEPT`
         """
-        self.reset()
-        for transition_message in transition_messages:
-            rv = self.exec_transition(transition_message)
-            if rv == DFSMAcceptor.FAIL:
+        # step through the integer transition table, and only map back to a state object at the end
+        table = self._table
+        n_messages = len(self._message_ids)
+        state_id = self._state_ids[self.start_state]
+        for message_id in map(self._message_ids.get, transition_messages):
+            if message_id is None:
+                self.state = self._states[state_id]
                 return DFSMAcceptor.FAIL
+            new_state_id = table[state_id * n_messages + message_id]
+            if new_state_id < 0:
+                self.state = self._states[state_id]
+                return DFSMAcceptor.FAIL
+            state_id = new_state_id
+        self.state = self._states[state_id]
         if self.state == self.accepting_state:
             return DFSMAcceptor.ACCEPT
         return DFSMAcceptor.FAIL
@@ -335,11 +568,78 @@ class EnhancedDataClass(object):
         LIKELY_INITIAL_VOWEL_SOUNDS (:obj:`set` of :obj:`str`): initial letters of words that will
             be preceeded by 'an'
         DO_NOT_PICKLE (:obj:`set` of :obj:`str`): fields in a dataclass that cannot be pickled
+        _FIELD_META (:obj:`dict`): map from the name of each field to a tuple of the field, its
+            runtime type (a class or tuple of classes), the name of that type, the article that
+            precedes the name, and whether the field has a default; cached separately in each subclass
     """
 
     LIKELY_INITIAL_VOWEL_SOUNDS = {'a', 'e', 'i', 'o', 'u'}
     DO_NOT_PICKLE = set()
 
+    @classmethod
+    def _get_field_meta(cls):
+        """ Get the metadata needed to validate the fields of a dataclass
+
+        The metadata is built the first time it's needed, and then cached in the class, because
+        `@dataclass` adds fields to a class after it has been created. Type annotations are
+        resolved with :obj:`typing.get_type_hints`, so that string annotations can be used.
+
+        Returns:
+            :obj:`dict`: map from field name to a tuple of the :obj:`dataclasses.Field`, its runtime
+                type, the name of that type, the article that precedes the name, and whether the
+                field has a default
+        """
+        field_meta = cls.__dict__.get('_FIELD_META')
+        if field_meta is None:
+            try:
+                type_hints = typing.get_type_hints(cls)
+            except (NameError, TypeError):
+                type_hints = {}
+            field_meta = {}
+            for field in dataclasses.fields(cls):
+                field_type = cls._get_runtime_type(type_hints.get(field.name, field.type))
+                if isinstance(field_type, tuple):
+                    type_name = ' or '.join(a_type.__name__ for a_type in field_type)
+                else:
+                    type_name = field_type.__name__
+                # place the right article before a type name, approximately
+                single_article = 'a'
+                if type_name[0].lower() in cls.LIKELY_INITIAL_VOWEL_SOUNDS:
+                    single_article = 'an'
+                # dataclasses.MISSING is the value used for default if no default is provided
+                has_default = field.default is not dataclasses.MISSING
+                field_meta[field.name] = (field, field_type, type_name, single_article, has_default)
+            cls._FIELD_META = field_meta
+        return field_meta
+
+    @staticmethod
+    def _get_runtime_type(type_hint):
+        """ Get the class or classes that values of a type hint must be instances of
+
+        Args:
+            type_hint (:obj:`object`): a type hint, such as a class, :obj:`typing.Union`,
+                :obj:`typing.Optional` or a generic such as :obj:`typing.List`
+
+        Returns:
+            :obj:`type` or :obj:`tuple` of :obj:`type`: a class or tuple of classes that can be
+                passed to :obj:`isinstance`
+        """
+        if type_hint is typing.Any:
+            return object
+        origin = getattr(type_hint, '__origin__', None)
+        if origin is typing.Union:
+            runtime_types = []
+            for arg in type_hint.__args__:
+                runtime_type = EnhancedDataClass._get_runtime_type(arg)
+                if isinstance(runtime_type, tuple):
+                    runtime_types.extend(runtime_type)
+                else:
+                    runtime_types.append(runtime_type)
+            return tuple(runtime_types)
+        if isinstance(origin, type):
+            return origin
+        return type_hint
+
     def validate_dataclass_type(self, attr_name):
         """ Validate the type of an attribute in a dataclass instance
 
@@ -353,32 +653,36 @@ class EnhancedDataClass(object):
             :obj:`ValueError`: if `attr_name` is not the name of a field
             :obj:`TypeError`: if attribute `attr_name` does not have the right type
         """
-        fields_map = {field.name: field for field in dataclasses.fields(self)}
-        if attr_name not in fields_map:
+        field_meta = self._get_field_meta()
+        if attr_name not in field_meta:
             raise ValueError(f"'{attr_name}' must be a field in {self.__class__.__name__}")
+        self._validate_field(*field_meta[attr_name])
 
-        # validate type
-        field = fields_map[attr_name]
-        attr = getattr(self, field.name)
+    def _validate_field(self, field, field_type, type_name, single_article, has_default):
+        """ Validate the type of a field in a dataclass instance
 
-        # place the right article before a type name, approximately
-        single_article = 'a'
-        if field.type.__name__[0].lower() in self.LIKELY_INITIAL_VOWEL_SOUNDS:
-            single_article = 'an'
+        Args:
+            field (:obj:`dataclasses.Field`): the field
+            field_type (:obj:`type` or :obj:`tuple` of :obj:`type`): the field's runtime type
+            type_name (:obj:`str`): the name of `field_type`
+            single_article (:obj:`str`): the article that precedes `type_name`
+            has_default (:obj:`bool`): whether the field has a default
+
+        Raises:
+            :obj:`TypeError`: if the field does not have the right type
+        """
+        attr = getattr(self, field.name)
 
         # accept int inputs to float fields
-        if isinstance(attr, int) and field.type is float:
+        if isinstance(attr, int) and field_type is float:
             attr = float(attr)
             setattr(self, field.name, attr)
 
-        # dataclasses._MISSING_TYPE is the value used for default if no default is provided
-        if 'dataclasses._MISSING_TYPE' in str(field.default):
-            if not isinstance(attr, field.type):
-                raise TypeError(f"{field.name} ('{attr}') must be {single_article} {field.type.__name__}")
-        else:
-            if (field.default is None and attr is not None) or field.default is not None:
-                if not isinstance(attr, field.type):
-                    raise TypeError(f"{field.name} ('{attr}') must be {single_article} {field.type.__name__}")
+        # a field whose default is None may be None
+        if has_default and field.default is None and attr is None:
+            return
+        if not isinstance(attr, field_type):
+            raise TypeError(f"{field.name} ('{attr}') must be {single_article} {type_name}")
 
     def validate_dataclass_types(self):
         """ Validate the types of all attributes in a dataclass instance
@@ -390,13 +694,18 @@ class EnhancedDataClass(object):
             :obj:`error_type`: if an attribute does not have the right type
         """
         # validate types
-        for field in dataclasses.fields(self):
-            self.validate_dataclass_type(field.name)
+        for field_meta in self._get_field_meta().values():
+            self._validate_field(*field_meta)
 
     def __setattr__(self, name, value):
-        """ Validate a dataclass attribute when it is changed """
+        """ Validate a dataclass attribute when it is changed
+
+        Attributes that are not fields, such as private caches, are set without validation.
+        """
         object.__setattr__(self, name, value)
-        self.validate_dataclass_type(name)
+        field_meta = self._get_field_meta().get(name)
+        if field_meta is not None:
+            self._validate_field(*field_meta)
 
     def prepare_to_pickle(self):
         """ Provide a copy of this instance that can be pickled; recursively calls nested :obj:`EnhancedDataClass`\ s
@@ -406,19 +715,25 @@ class EnhancedDataClass(object):
         Returns:
             :obj:`SimulationConfig`: a copy of `self` that can be pickled
         """
-        to_pickle = copy.deepcopy(self)
+        # copy field by field, so that fields which will be replaced are never deep copied
+        to_pickle = copy.copy(self)
+        memo = {}
         for field in dataclasses.fields(self):
             attr = getattr(self, field.name)
             if field.name in self.DO_NOT_PICKLE:
                 setattr(to_pickle, field.name, None)
             elif isinstance(attr, EnhancedDataClass):
-                setattr(to_pickle, field.name, attr.prepare_to_pickle())
+                object.__setattr__(to_pickle, field.name, attr.prepare_to_pickle())
+            else:
+                object.__setattr__(to_pickle, field.name, copy.deepcopy(attr, memo))
         return to_pickle
 
     @classmethod
     def write_dataclass(cls, dataclass, dirname):
         """ Save an `EnhancedDataClass` object to the directory `dirname`
 
+        The object is pickled with the highest protocol available, through a 1 MB buffer.
+
         Args:
             dataclass (:obj:`EnhancedDataClass`): an `EnhancedDataClass` instance
             dirname (:obj:`str`): directory for holding the dataclass
@@ -430,8 +745,8 @@ class EnhancedDataClass(object):
         if os.path.isfile(pathname):
             raise ValueError(f"'{pathname}' already exists")
 
-        with open(pathname, 'wb') as file:
-            pickle.dump(dataclass.prepare_to_pickle(), file)
+        with open(pathname, 'wb', buffering=2**20) as file:
+            pickle.dump(dataclass.prepare_to_pickle(), file, protocol=pickle.HIGHEST_PROTOCOL)
 
     @classmethod
     def read_dataclass(cls, dirname):
@@ -446,7 +761,7 @@ class EnhancedDataClass(object):
         pathname = cls.get_pathname(dirname)
 
         # load and return this EnhancedDataClass
-        with open(pathname, 'rb') as file:
+        with open(pathname, 'rb', buffering=2**20) as file:
             return pickle.load(file)
 
     @staticmethod
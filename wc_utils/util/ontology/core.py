@@ -6,8 +6,6 @@
 :License: MIT
 """
 
-import pronto
-
 
 def are_terms_equivalent(term1, term2):
     """ Determine if two terms are semantically equivalent
@@ -19,4 +17,6 @@ def are_terms_equivalent(term1, term2):
     Returns:
         :obj:`bool`: :obj:`True` if the terms are semantically equivalent
     """
-    return term1 == term2
+    # identical terms are trivially equivalent; this avoids resolving the ids of
+    # the terms through their ontologies
+    return term1 is term2 or term1 == term2
@@ -6,7 +6,6 @@
 :License: MIT
 """
 
-from numpy import random as numpy_random
 from wc_utils.util.types import is_iterable
 import math
 import numpy as np
@@ -19,20 +18,31 @@ class RandomStateManager(object):
     _random_state = None
     #:obj:`numpy.random.RandomState`: singleton random state
 
+    _bit_generator = None
+    #:obj:`type`: bit generator of the singleton random state, or :obj:`None` for the legacy MT19937 generator
+
     @classmethod
-    def initialize(cls, seed=None):
+    def initialize(cls, seed=None, bit_generator=None):
         """ Constructs the singleton random state, if it doesn't already exist
         and seeds the random state.
 
         Args:
             seed (:obj:`int`): random number generator seed
+            bit_generator (:obj:`type`, optional): subclass of :obj:`numpy.random.BitGenerator`, such as
+                :obj:`numpy.random.PCG64`, which is faster than the default legacy-seeded MT19937 generator.
+                Because only MT19937 generators can be re-seeded, a new random state is constructed when
+                this is provided.
         """
-        if not cls._random_state:
-            cls._random_state = RandomState(seed=seed)
         if seed is None:
             config = wc_utils.config.core.get_config()['wc_utils']['random']
             seed = config['seed']
-        cls._random_state.seed(seed)
+        if bit_generator is not None:
+            cls._random_state = RandomState(bit_generator(seed))
+        elif cls._random_state is None or cls._bit_generator is not None:
+            cls._random_state = RandomState(seed=seed)
+        else:
+            cls._random_state.seed(seed)
+        cls._bit_generator = bit_generator
 
     @classmethod
     def instance(cls):
@@ -49,24 +59,30 @@ class RandomStateManager(object):
 class RandomState(np.random.RandomState):
     """ Enhanced random state with additional random methods for
     * Rounding
+
+    Like :obj:`numpy.random.RandomState`, this can be constructed from a seed, which uses the legacy MT19937
+    generator, or from a bit generator such as :obj:`numpy.random.PCG64`.
     """
 
     def round(self, x, method='binomial'):
         """Stochastically round a floating point value.
 
         Args:
-            x (:obj:`float`): a value to be rounded.
+            x (:obj:`float` or :obj:`numpy.ndarray` of :obj:`float`): value(s) to be rounded; arrays
+                are rounded elementwise
             method (:obj:`str`, optional): the type of rounding to use. The default is 'binomial'.
 
         Returns:
-            :obj:`int`: rounded value of `x`.
+            :obj:`int` or :obj:`numpy.ndarray` of :obj:`int`: rounded value(s) of `x`.
 
         Raises:
-            :obj:`Exception`: if `method` is not one of the valid types: 'binomial', 'midpoint',
-                'poisson', and 'quadratic'.
+            :obj:`Exception`: if `method` is not one of the valid types: 'binomial', 'binomial_bits',
+                'midpoint', 'poisson', and 'quadratic'.
         """
         if method == 'binomial':
             return self.round_binomial(x)
+        elif method == 'binomial_bits':
+            return self.round_binomial_bits(x)
         elif method == 'midpoint':
             return self.round_midpoint(x)
         elif method == 'poisson':
@@ -88,13 +104,62 @@ class RandomState(np.random.RandomState):
         especially with small populations.
         The mean of the rounded values for a set of floats converges to the mean of the floats.
 
+        Arrays of values are rounded in a single vectorized step.
+
         Args:
-            x (:obj:`float`): a value to be rounded.
+            x (:obj:`float` or :obj:`numpy.ndarray` of :obj:`float`): value(s) to be rounded.
 
         Returns:
-            :obj:`int`: rounded value of `x`.
+            :obj:`int` or :obj:`numpy.ndarray` of :obj:`int`: rounded value(s) of `x`.
+        """
+        if np.isscalar(x):
+            return math.floor(x + self.random_sample())
+        x = np.asarray(x, dtype=np.float64)
+        return np.floor(x + self.random_sample(x.shape)).astype(np.int64)
+
+    def round_binomial_bits(self, x):
+        """Stochastically round a float, using 32 random bits rather than a random float
+
+        Equivalent to :obj:`round_binomial`, except that the probability of rounding up is resolved
+        to 2^-32. Round `x` up if a random 32-bit unsigned integer is less than the fractional part of
+        `x` scaled by 2^32. This draws one 32-bit random integer per value, rather than the two that
+        are needed to generate a random double.
+
+        Args:
+            x (:obj:`float` or :obj:`numpy.ndarray` of :obj:`float`): value(s) to be rounded.
+
+        Returns:
+            :obj:`int` or :obj:`numpy.ndarray` of :obj:`int`: rounded value(s) of `x`.
         """
-        return math.floor(x + self.random_sample())
+        if np.isscalar(x):
+            floor = math.floor(x)
+            return floor + int(self.randint(2**32, dtype=np.uint32) < (x - floor) * 2**32)
+        x = np.asarray(x, dtype=np.float64)
+        floor = np.floor(x)
+        return floor.astype(np.int64) + (self.randint(2**32, size=x.shape, dtype=np.uint32) < (x - floor) * 2**32)
+
+    def round_bfloat16(self, x):
+        """Stochastically round single-precision floats to the precision of bfloat16
+
+        bfloat16 floats are the upper 16 bits of single-precision floats. Each value is rounded away from zero
+        to the next bfloat16 float with probability equal to the fraction of the distance between the two
+        floats that its lower 16 bits represent. This is achieved by adding 16 random bits to the lower 16 bits
+        of the value, and then truncating them. Two values are rounded with each 32-bit random integer.
+        `nan` values are preserved.
+
+        Args:
+            x (:obj:`float` or :obj:`numpy.ndarray` of :obj:`float`): value(s) to be rounded
+
+        Returns:
+            :obj:`numpy.float32` or :obj:`numpy.ndarray` of :obj:`numpy.float32`: rounded value(s) of `x`,
+                which can be represented exactly by bfloat16
+        """
+        x = np.asarray(x, dtype=np.float32)
+        random_bits = self.randint(2**32, size=(x.size + 1) // 2, dtype=np.uint32).view(np.uint16)[:x.size]
+        bits = x.reshape(-1).view(np.uint32) + random_bits
+        bits &= np.uint32(0xFFFF0000)
+        rounded = np.where(np.isnan(x), x, bits.view(np.float32).reshape(x.shape))
+        return rounded[()]
 
     def round_midpoint(self, x):
         '''Round to the closest integer; if the fractional part of `x` is 0.5, randomly round up or down.
@@ -103,12 +168,21 @@ class RandomState(np.random.RandomState):
         round `x` up or down. This avoids rounding bias if the distribution of `x` is not uniform.
         See http://www.clivemaxfield.com/diycalculator/sp-round.shtml#A15
 
+        Arrays of values are rounded with vectorized comparisons, drawing all of the random ties at once.
+
         Args:
-            x (:obj:`float`): a value to be rounded
+            x (:obj:`float` or :obj:`numpy.ndarray` of :obj:`float`): value(s) to be rounded
 
         Returns:
-            :obj:`int`: rounded value of `x`
+            :obj:`int` or :obj:`numpy.ndarray` of :obj:`int`: rounded value(s) of `x`
         '''
+        if not np.isscalar(x):
+            x = np.asarray(x, dtype=np.float64)
+            floor = np.floor(x)
+            fraction = x - floor
+            up = (0.5 < fraction) | ((fraction == 0.5) & (self.randint(2, size=x.shape) == 0))
+            return floor.astype(np.int64) + up
+
         fraction = x - math.floor(x)
         if fraction < 0.5:
             return math.floor(x)
@@ -141,14 +215,17 @@ class RandomState(np.random.RandomState):
         unif(0,1) random variable is 0.5.
 
         Args:
-            x (:obj:`float`): a value to be rounded.
+            x (:obj:`float` or :obj:`numpy.ndarray` of :obj:`float`): value(s) to be rounded.
 
         Returns:
-            :obj:`int`: rounded value of `x`.
+            :obj:`int` or :obj:`numpy.ndarray` of :obj:`int`: rounded value(s) of `x`.
         """
-        return math.floor(x + self.std())
+        if np.isscalar(x):
+            return math.floor(x + self.std())
+        x = np.asarray(x, dtype=np.float64)
+        return np.floor(x + self.std(x.shape)).astype(np.int64)
 
-    def std(self):
+    def std(self, size=None):
         """Sample a symmetric triangular distribution.
 
         The pdf of symmetric triangular distribution is
@@ -159,30 +236,61 @@ class RandomState(np.random.RandomState):
 
         See https://en.wikipedia.org/wiki/Triangular_distribution.
 
+        Args:
+            size (:obj:`int` or :obj:`tuple` of :obj:`int`, optional): shape of an array of samples
+
         Returns:
-            :obj:`float`: a sample from a symmetric triangular distribution.
+            :obj:`float` or :obj:`numpy.ndarray` of :obj:`float`: a sample, or, if `size` is
+                provided, an array of samples from a symmetric triangular distribution.
         """
-        return (self.random_sample()+self.random_sample())/2
+        u1, u2 = self._random_sample_pair(size)
+        return (u1+u2)/2
 
-    def ltd(self):
+    def ltd(self, size=None):
         """Sample a left triangular distribution.
 
         The pdf of ltd is f(x) = 2(1-x) for 0<=x<=1, and 0 elsewhere.
 
+        Args:
+            size (:obj:`int` or :obj:`tuple` of :obj:`int`, optional): shape of an array of samples
+
         Returns:
-            :obj:`float`: a sample from a left triangular distribution.
+            :obj:`float` or :obj:`numpy.ndarray` of :obj:`float`: a sample, or, if `size` is
+                provided, an array of samples from a left triangular distribution.
         """
-        return abs(self.random_sample()-self.random_sample())
+        u1, u2 = self._random_sample_pair(size)
+        return abs(u1-u2)
 
-    def rtd(self):
+    def rtd(self, size=None):
         """Sample a right triangular distribution.
 
         The pdf of rtd is f(x) = 2x for 0<=x<=1, and 0 elsewhere.
 
+        Args:
+            size (:obj:`int` or :obj:`tuple` of :obj:`int`, optional): shape of an array of samples
+
+        Returns:
+            :obj:`float` or :obj:`numpy.ndarray` of :obj:`float`: a sample, or, if `size` is
+                provided, an array of samples from a right triangular distribution.
+        """
+        return 1-self.ltd(size)
+
+    def _random_sample_pair(self, size=None):
+        """Draw two samples, or two arrays of samples, from the uniform distribution with one call
+        to the generator. The samples are the same as those of two consecutive calls to
+        :obj:`random_sample`.
+
+        Args:
+            size (:obj:`int` or :obj:`tuple` of :obj:`int`, optional): shape of each array of samples
+
         Returns:
-            :obj:`float`: a sample from a right triangular distribution.
+            :obj:`numpy.ndarray`: an array whose first and second elements are the two samples
         """
-        return 1-self.ltd()
+        if size is None:
+            return self.random_sample(2)
+        if isinstance(size, (int, np.integer)):
+            size = (size,)
+        return self.random_sample((2,) + tuple(size))
 
 def validate_random_state(random_state):
     """ Validates a random state
@@ -203,18 +311,18 @@ def validate_random_state(random_state):
     if random_state[0] != 'MT19937':
         raise InvalidRandomStateException('Random random_state[0] must be equal to "MT19937"')
 
-    if not is_iterable(random_state[1]) or len(random_state[1]) != 624:
+    # check the dtype and shape of the key at once rather than testing each of its 624 elements
+    key = random_state[1]
+    if not isinstance(key, np.ndarray):
+        key = np.asarray(key) if is_iterable(key) else None
+    if key is None or key.shape != (624,) or not np.issubdtype(key.dtype, np.integer):
         raise InvalidRandomStateException(
             'Random number generator random_state[1] must be an array of length 624 of unsigned ints')
-    for r in random_state[1]:
-        if not isinstance(r, (int, np.uint32)):
-            raise InvalidRandomStateException(
-                'Random number generator random_state[1] must be an array of length 624 of unsigned ints')
 
-    if not isinstance(random_state[2], int):
+    if not isinstance(random_state[2], (int, np.integer)):
         raise InvalidRandomStateException('Random number generator random_state[2] must be an int')
 
-    if not isinstance(random_state[3], int):
+    if not isinstance(random_state[3], (int, np.integer)):
         raise InvalidRandomStateException('Random number generator random_state[3] must be an int')
 
     if not isinstance(random_state[4], float):
@@ -223,6 +331,29 @@ def validate_random_state(random_state):
     return True
 
 
+def validate_bit_generator_state(random_state):
+    """ Validates the state of a random state which is constructed from a bit generator, such as the
+    state returned by :obj:`numpy.random.RandomState.get_state` with :obj:`legacy` set to :obj:`False`
+
+    Args:
+        random_state (:obj:`obj`): random state
+
+    Raises:
+        :obj:`InvalidRandomStateException`: if `random_state` is not valid
+    """
+    if not isinstance(random_state, dict):
+        raise InvalidRandomStateException('Random state must be a dict')
+
+    bit_generator = getattr(np.random, str(random_state.get('bit_generator')), None)
+    if not isinstance(bit_generator, type) or not issubclass(bit_generator, np.random.BitGenerator):
+        raise InvalidRandomStateException('Random state["bit_generator"] must be the name of a bit generator')
+
+    if not isinstance(random_state.get('state'), dict):
+        raise InvalidRandomStateException('Random state["state"] must be a dict')
+
+    return True
+
+
 class InvalidRandomStateException(Exception):
     ''' An exception for invalid random states '''
     pass
@@ -7,6 +7,7 @@
 :License: MIT
 """
 
+import math
 import numpy
 from math import isclose
 
@@ -20,9 +21,15 @@ class ExponentialMovingAverage(object):
 
     Attributes:
         value (:obj:`float`): the current average
-        alpha (:obj:`float`): the decay factor        
+        alpha (:obj:`float`): the decay factor
+        one_minus_alpha (:obj:`float`): the complement of the decay factor, 1 - :obj:`alpha`
     """
 
+    __slots__ = ('alpha', 'one_minus_alpha', 'value')
+
+    # bound on the decay, in natural-log units, of the oldest value within each block of :obj:`add_values`
+    _MAX_LOG_DECAY = 230.
+
     def __init__(self, value, alpha=None, center_of_mass=None):
         """ Initialize an ExponentialMovingAverage.
 
@@ -45,6 +52,7 @@ class ExponentialMovingAverage(object):
             raise ValueError("`alpha` or `center_of_mass` must be provided")
         if self.alpha < 0 or 1 < self.alpha:
             raise ValueError("`alpha` must satisfy 0 <= `alpha` <= 1: but `alpha`={}".format(self.alpha))
+        self.one_minus_alpha = 1. - self.alpha
         self.value = float(value)
 
     def add_value(self, new_value):
@@ -56,9 +64,47 @@ class ExponentialMovingAverage(object):
         Returns:
             :obj:`float`: the updated exponential moving average
         """
-        self.value = (self.alpha * new_value) + (1. - self.alpha) * self.value
+        self.value = (self.alpha * new_value) + self.one_minus_alpha * self.value
         return self.value
 
+    def add_values(self, new_values):
+        """ Add a sequence of samples to this :obj:`ExponentialMovingAverage`, and update the average.
+
+        The recurrence is evaluated in blocks with NumPy. Within each block, the average is the decayed
+        initial average plus a cumulative sum of the samples, each scaled by the inverse of its decay. The
+        blocks are short enough that these scale factors cannot overflow.
+
+        Args:
+            new_values (:obj:`list` of :obj:`float`): the next values to contribute to the exponential
+                moving average, in order
+
+        Returns:
+            :obj:`numpy.ndarray`: the exponential moving average after each value is added
+        """
+        new_values = numpy.asarray(new_values, dtype=numpy.float64).ravel()
+        decay = self.one_minus_alpha
+        if new_values.size == 0:
+            return new_values
+        if decay == 0.:
+            averages = new_values.copy()
+        elif decay == 1.:
+            averages = numpy.full(new_values.shape, self.value)
+        else:
+            block_size = max(1, int(self._MAX_LOG_DECAY / -math.log(decay)))
+            averages = numpy.empty(new_values.shape)
+            value = self.value
+            for start in range(0, new_values.size, block_size):
+                values = new_values[start:start + block_size]
+                decays = decay ** numpy.arange(1, values.size + 1)
+                block = averages[start:start + values.size]
+                numpy.cumsum(values / decays, out=block)
+                block *= self.alpha
+                block += value
+                block *= decays
+                value = block[-1]
+        self.value = float(averages[-1])
+        return averages
+
     def get_ema(self):
         """ Get the curent average
 
@@ -104,24 +150,24 @@ def weighted_mean(values, weights, ignore_nan=True):
     Returns:
         :obj:`float`: mean of :obj:`values`, weighted by :obj:`weights`
     """
-    if not ignore_nan and (any(numpy.isnan(values)) or any(numpy.isnan(weights))):
+    filtered = _filter_weighted_values(values, weights, ignore_nan)
+    if filtered is None:
         return numpy.nan
+    values, weights = filtered
 
-    values = 1. * numpy.array(values)
-    weights = 1. * numpy.array(weights)
+    return numpy.average(values, weights=weights)
 
-    tfs = numpy.logical_and(numpy.logical_not(numpy.isnan(values)), weights > 0)
-    values = numpy.extract(tfs, values)
-    weights = numpy.extract(tfs, weights)
-    if values.size == 0:
-        return numpy.nan
 
-    return numpy.average(values, weights=weights)
+# maximum number of values for which :obj:`weighted_percentile` sorts the values rather than partitioning them
+_MAX_SORTED_PERCENTILE_SIZE = 4096
 
 
 def weighted_percentile(values, weights, percentile, ignore_nan=True):
     """ Calculate percentile of a list of values, weighted by :obj:`weights`
 
+    Large lists of values are not sorted. Instead, the percentile is selected by repeatedly partitioning
+    the values around their median.
+
     Args:
         values (:obj:`list` of :obj:`float`): values
         weights (:obj:`list` of :obj:`float`): weights
@@ -130,68 +176,167 @@ def weighted_percentile(values, weights, percentile, ignore_nan=True):
 
     Returns:
         :obj:`float`: weighted percentile of :obj:`values`
-    """
-    if not ignore_nan and (any(numpy.isnan(values)) or any(numpy.isnan(weights))):
-        return numpy.nan
 
-    values = 1. * numpy.array(values)
-    weights = 1. * numpy.array(weights)
+    Raises:
+        :obj:`ValueError`: if :obj:`percentile` is not between 0 and 100
+    """
+    if not 0. <= percentile <= 100.:
+        raise ValueError("`percentile` must satisfy 0 <= `percentile` <= 100: but `percentile`={}".format(
+            percentile))
 
-    tfs = numpy.logical_and(numpy.logical_not(numpy.isnan(values)), weights > 0)
-    values = numpy.extract(tfs, values)
-    weights = numpy.extract(tfs, weights)
-    if values.size == 0:
+    filtered = _filter_weighted_values(values, weights, ignore_nan)
+    if filtered is None:
         return numpy.nan
+    values, weights = filtered
+
+    if values.size <= _MAX_SORTED_PERCENTILE_SIZE:
+        return _sorted_weighted_percentiles(values, weights, numpy.float64(percentile) / 100.)[()]
+
+    prob = percentile / 100.
+    target = prob * weights.sum()
+    lower_weight = 0.
+    next_value = None
+    while values.size > _MAX_SORTED_PERCENTILE_SIZE:
+        pivot = numpy.partition(values, values.size // 2)[values.size // 2]
+
+        tfs = values < pivot
+        lt_weight = lower_weight + weights[tfs].sum()
+        if lt_weight >= target and tfs.any():
+            values = values[tfs]
+            weights = weights[tfs]
+            next_value = pivot
+            continue
+
+        gt_tfs = values > pivot
+        le_weight = lt_weight + weights[values == pivot].sum()
+        if le_weight >= target or not gt_tfs.any():
+            if le_weight == target:
+                # the percentile is the mean of the pivot and the next larger value, which is either in the
+                # current partition or is the pivot of a previous partition
+                if gt_tfs.any():
+                    return (pivot + values[gt_tfs].min()) / 2.
+                if next_value is not None:
+                    return (pivot + next_value) / 2.
+            return pivot
+
+        values = values[gt_tfs]
+        weights = weights[gt_tfs]
+        lower_weight = le_weight
 
     ind = numpy.argsort(values)
     sorted_values = values[ind]
-    sorted_weights = weights[ind]
-    total_weight = sorted_weights.sum()
-
-    probabilities = sorted_weights.cumsum() / total_weight
+    cum_weights = lower_weight + weights[ind].cumsum()
+    ind = min(numpy.searchsorted(cum_weights, target), sorted_values.size - 1)
+    if cum_weights[ind] == target:
+        if ind + 1 < sorted_values.size:
+            return (sorted_values[ind] + sorted_values[ind + 1]) / 2.
+        elif next_value is not None:
+            return (sorted_values[ind] + next_value) / 2.
+    return sorted_values[ind]
 
-    ind = numpy.searchsorted(probabilities, percentile / 100.)
-    if probabilities[ind] == percentile / 100.:
-        return numpy.mean(sorted_values[ind:ind+2])
-    else:
-        return sorted_values[ind]
 
+def weighted_percentiles(values, weights, percentiles, ignore_nan=True):
+    """ Calculate several percentiles of a list of values, weighted by :obj:`weights`
 
-def weighted_median(values, weights, ignore_nan=True):
-    """ Calculate the median of a list of values, weighted by :obj:`weights`
+    The values are sorted once for all of the percentiles.
 
     Args:
         values (:obj:`list` of :obj:`float`): values
         weights (:obj:`list` of :obj:`float`): weights
+        percentiles (:obj:`list` of :obj:`float`): percentiles
         ignore_nan (:obj:`bool`, optional): if :obj:`True`, ignore `nan` values
 
     Returns:
-        :obj:`float`: weighted median of :obj:`values`
+        :obj:`numpy.ndarray`: weighted percentiles of :obj:`values`, with the same shape as :obj:`percentiles`
+
+    Raises:
+        :obj:`ValueError`: if any of :obj:`percentiles` is not between 0 and 100
     """
-    if not ignore_nan and (any(numpy.isnan(values)) or any(numpy.isnan(weights))):
-        return numpy.nan
+    probs = numpy.asarray(percentiles, dtype=numpy.float64) / 100.
+    if not ((0. <= probs) & (probs <= 1.)).all():
+        raise ValueError("`percentiles` must satisfy 0 <= `percentiles` <= 100: but `percentiles`={}".format(
+            percentiles))
+
+    filtered = _filter_weighted_values(values, weights, ignore_nan)
+    if filtered is None:
+        return numpy.full(probs.shape, numpy.nan)
+    values, weights = filtered
+
+    return _sorted_weighted_percentiles(values, weights, probs)
+
 
-    values = 1. * numpy.array(values)
-    weights = 1. * numpy.array(weights)
+def _filter_weighted_values(values, weights, ignore_nan):
+    """ Convert values and weights to arrays, and remove `nan` values and values without positive weights
+
+    Args:
+        values (:obj:`list` of :obj:`float`): values
+        weights (:obj:`list` of :obj:`float`): weights
+        ignore_nan (:obj:`bool`): if :obj:`True`, ignore `nan` values
 
-    tfs = numpy.logical_and(numpy.logical_not(numpy.isnan(values)), weights > 0)
-    values = numpy.extract(tfs, values)
-    weights = numpy.extract(tfs, weights)
+    Returns:
+        :obj:`tuple` of :obj:`numpy.ndarray`: values and their weights, or :obj:`None` if there are no
+            values, or if there is a `nan` value or weight and :obj:`ignore_nan` is :obj:`False`
+    """
+    values = numpy.asarray(values, dtype=numpy.float64)
+    weights = numpy.asarray(weights, dtype=numpy.float64)
+
+    nan_values = numpy.isnan(values)
+    if not ignore_nan and (nan_values.any() or numpy.isnan(weights).any()):
+        return None
+
+    tfs = weights > 0
+    tfs &= ~nan_values
+    values = values[tfs]
+    weights = weights[tfs]
     if values.size == 0:
-        return numpy.nan
+        return None
+
+    return values, weights
+
+
+def _sorted_weighted_percentiles(values, weights, probs):
+    """ Calculate weighted percentiles by sorting values
 
+    Args:
+        values (:obj:`numpy.ndarray`): values
+        weights (:obj:`numpy.ndarray`): positive weights
+        probs (:obj:`numpy.ndarray`): percentiles, as fractions
+
+    Returns:
+        :obj:`numpy.ndarray`: weighted percentiles of :obj:`values`, with the same shape as :obj:`probs`
+    """
     ind = numpy.argsort(values)
     sorted_values = values[ind]
+    if sorted_values[0] == sorted_values[-1]:
+        return numpy.full(probs.shape, sorted_values[0])
     sorted_weights = weights[ind]
-    total_weight = sorted_weights.sum()
 
-    probabilities = sorted_weights.cumsum() / total_weight
+    # the last cumulative weight is the total weight, so the final probability is exactly 1
+    probabilities = sorted_weights.cumsum()
+    probabilities /= probabilities[-1]
+
+    # a percentile which falls exactly between two values, for which the left and right insertion
+    # points differ, is the mean of the values
+    ind = numpy.searchsorted(probabilities, probs, side='left')
+    right_ind = numpy.searchsorted(probabilities, probs, side='right')
+    next_ind = numpy.minimum(right_ind, sorted_values.size - 1)
+    return numpy.where(ind != right_ind,
+                       (sorted_values[ind] + sorted_values[next_ind]) / 2.,
+                       sorted_values[ind])
+
+
+def weighted_median(values, weights, ignore_nan=True):
+    """ Calculate the median of a list of values, weighted by :obj:`weights`
+
+    Args:
+        values (:obj:`list` of :obj:`float`): values
+        weights (:obj:`list` of :obj:`float`): weights
+        ignore_nan (:obj:`bool`, optional): if :obj:`True`, ignore `nan` values
 
-    ind = numpy.searchsorted(probabilities, 0.5)
-    if probabilities[ind] == 0.5:
-        return numpy.mean(sorted_values[ind:ind+2])
-    else:
-        return sorted_values[ind]
+    Returns:
+        :obj:`float`: weighted median of :obj:`values`
+    """
+    return weighted_percentile(values, weights, 50., ignore_nan=ignore_nan)
 
 
 def weighted_mode(values, weights, ignore_nan=True):
@@ -205,28 +350,18 @@ def weighted_mode(values, weights, ignore_nan=True):
     Returns:
         :obj:`float`: weighted mode of :obj:`values`
     """
-    if not ignore_nan and (any(numpy.isnan(values)) or any(numpy.isnan(weights))):
-        return numpy.nan
-
-    values = 1. * numpy.array(values)
-    weights = 1. * numpy.array(weights)
-
-    tfs = numpy.logical_and(numpy.logical_not(numpy.isnan(values)), weights > 0)
-    values = numpy.extract(tfs, values)
-    weights = numpy.extract(tfs, weights)
-    if values.size == 0:
+    filtered = _filter_weighted_values(values, weights, ignore_nan)
+    if filtered is None:
         return numpy.nan
+    values, weights = filtered
 
     ind = numpy.argsort(values)
     sorted_values = values[ind]
     sorted_weights = weights[ind]
 
-    cum_weights = sorted_weights.cumsum()
-
-    tfs = numpy.concatenate(((numpy.diff(sorted_values[::-1])[::-1] < 0), [True]))
-
-    sorted_values = numpy.extract(tfs, sorted_values)
-    cum_weights = numpy.extract(tfs, cum_weights)
-
-    sorted_weights = numpy.diff(numpy.concatenate(([0], cum_weights)))
-    return sorted_values[numpy.argmax(sorted_weights)]
+    # sum the weights of each distinct value
+    starts = numpy.flatnonzero(sorted_values[1:] != sorted_values[:-1])
+    starts += 1
+    starts = numpy.concatenate(([0], starts))
+    value_weights = numpy.add.reduceat(sorted_weights, starts)
+    return sorted_values[starts[numpy.argmax(value_weights)]]
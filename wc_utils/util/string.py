@@ -8,8 +8,13 @@
 """
 
 import collections.abc
+import math
 import re
 
+# patterns which :obj:`camel_case_to_snake_case` uses to insert underscores before capitalized words
+_CAMEL_RE1 = re.compile(r'(.)([A-Z][a-z]+)')
+_CAMEL_RE2 = re.compile(r'([a-z0-9])([A-Z])')
+
 
 def indent_forest(forest, indentation=2, keep_trailing_blank_lines=False, return_list=False):
     """ Generate a string of lines, each indented by its depth in `forest`
@@ -39,7 +44,7 @@ def indent_forest(forest, indentation=2, keep_trailing_blank_lines=False, return
                                          keep_trailing_blank_lines=keep_trailing_blank_lines))
 
 
-def __indent_forest(forest, indentation, depth, keep_trailing_blank_lines):
+def __indent_forest(forest, indentation, depth, keep_trailing_blank_lines, output=None):
     """ Private, recursive method to generate a list of lines indented by their depth in a forest
 
     Args:
@@ -48,16 +53,18 @@ def __indent_forest(forest, indentation, depth, keep_trailing_blank_lines):
         depth (:obj:`int`): recursion depth, used by recursion
         keep_trailing_blank_lines (:obj:`Boolean`): if set, keep trailing blank lines in strings in
             `forest`
+        output (:obj:`list` of :obj:`str`, optional): list to append the lines to, used by recursion
 
     Returns:
         :obj:`list` of :obj:`str`: list of strings, appropriately indented
     """
     indent = ' ' * depth * indentation
-    output = []
+    if output is None:
+        output = []
     if _iterable_not_string(forest):
         for entry in forest:
             if _iterable_not_string(entry):
-                output += __indent_forest(entry, indentation, depth + 1, keep_trailing_blank_lines)
+                __indent_forest(entry, indentation, depth + 1, keep_trailing_blank_lines, output=output)
             else:
                 e_str = str(entry)
                 if '\n' in e_str:
@@ -74,7 +81,9 @@ def __indent_forest(forest, indentation, depth, keep_trailing_blank_lines):
 
 
 def _iterable_not_string(o):
-    # todo: try to simplify & generalize this by using isinstance(o, basestring)
+    # lists and tuples, the usual nodes of forests, are checked without consulting the ABC registry
+    if type(o) in (list, tuple):
+        return True
     return isinstance(o, collections.abc.Iterable) and not isinstance(o, str)
 
 
@@ -86,14 +95,13 @@ def delete_trailing_blanks(l_of_strings):
     Args:
         l_of_strings (:obj:`list` of :obj:`str`): a list of strings
     """
-    last = None
-    for i, e in reversed(list(enumerate(l_of_strings))):
-        e = e.rstrip()
-        if e:
+    last = len(l_of_strings)
+    for i in range(len(l_of_strings) - 1, -1, -1):
+        e = l_of_strings[i]
+        if e and not e.isspace():
             break
         last = i
-    if last is not None:
-        del l_of_strings[last:]
+    del l_of_strings[last:]
 
 
 def find_nth(s, sub, n, start=0, end=float('inf')):
@@ -104,7 +112,8 @@ def find_nth(s, sub, n, start=0, end=float('inf')):
         sub (:obj:`str`): substring to search for
         n (:obj:`int`): number of occurence to find the position of
         start (:obj:`int`, optional): starting position to search from
-        end (:obj:`int`, optional): end position to search within
+        end (:obj:`int` or :obj:`float`, optional): end position to search within; the substring must
+            lie before `end`, which may be a float, such as the default, infinity
 
     Returns:
         :obj:`int`: index of nth occurence of the substring within the string
@@ -119,20 +128,14 @@ def find_nth(s, sub, n, start=0, end=float('inf')):
     if n < 1:
         raise ValueError('n must be at least 1')
 
-    L = len(s)
+    end = math.ceil(max(min(end, len(s)), 0))
     l = len(sub)
-    count = 0
-    i = start
-    while i < min(end, L) - l + 1:
-        if s[i:i+l] == sub:
-            count += 1
-            if count == n:
-                return i
-            i += l
-        else:
-            i += 1
-
-    return -1
+    i = start - l
+    for _ in range(n):
+        i = s.find(sub, i + l, end)
+        if i == -1:
+            break
+    return i
 
 
 def rfind_nth(s, sub, n, start=0, end=float('inf')):
@@ -143,7 +146,8 @@ def rfind_nth(s, sub, n, start=0, end=float('inf')):
         sub (:obj:`str`): substring to search for
         n (:obj:`int`): number of occurence to find the position of
         start (:obj:`int`, optional): starting position to search from
-        end (:obj:`int`, optional): end position to search within
+        end (:obj:`int` or :obj:`float`, optional): end position to search within; the substring must
+            lie before `end`, which may be a float, such as the default, infinity
 
     Returns:
         :obj:`int`: index of nth-last occurence of the substring within the string
@@ -158,20 +162,12 @@ def rfind_nth(s, sub, n, start=0, end=float('inf')):
     if n < 1:
         raise ValueError('n must be at least 1')
 
-    L = len(s)
-    l = len(sub)
-    count = 0
-    i = min(L, end) - l
-    while i >= start:
-        if s[i:i+l] == sub:
-            count += 1
-            if count == n:
-                return i
-            i -= l
-        else:
-            i -= 1
-
-    return -1
+    i = math.ceil(max(min(end, len(s)), 0))
+    for _ in range(n):
+        i = s.rfind(sub, start, i)
+        if i == -1:
+            break
+    return i
 
 
 def partition_nth(s, sep, n):
@@ -263,8 +259,5 @@ def camel_case_to_snake_case(camel_case):
     Returns:
         :obj:`str`: string in snake case
     """
-    _underscorer1 = re.compile(r'(.)([A-Z][a-z]+)')
-    _underscorer2 = re.compile('([a-z0-9])([A-Z])')
-
-    subbed = _underscorer1.sub(r'\1_\2', camel_case)
-    return _underscorer2.sub(r'\1_\2', subbed).lower()
+    subbed = _CAMEL_RE1.sub(r'\1_\2', camel_case)
+    return _CAMEL_RE2.sub(r'\1_\2', subbed).lower()
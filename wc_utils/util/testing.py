@@ -8,6 +8,7 @@
 
 import humanfriendly
 import objsize
+import sys
 
 
 def assert_memory_less(obj, size, exclusive=False):
@@ -24,13 +25,10 @@ def assert_memory_less(obj, size, exclusive=False):
         :obj:`ValueError`: if the memory occupied by the object is greater than
             or equal to :obj:`size`
     """
-    if exclusive:
-        obj_size = objsize.get_exclusive_deep_size(obj)
-    else:
-        obj_size = objsize.get_deep_size(obj)
+    obj_size = _get_deep_size_up_to(obj, size, exclusive)
 
     if obj_size >= size:
-        raise ValueError("{} memory is greater than or equal to {}".format(
+        raise ValueError("Size of obj is at least {}, which is not less than the limit of {}".format(
             humanfriendly.format_size(obj_size),
             humanfriendly.format_size(size)))
 
@@ -49,12 +47,36 @@ def assert_memory_less_equal(obj, size, exclusive=False):
         :obj:`ValueError`: if the memory occupied by the object is greater than
             :obj:`size`
     """
-    if exclusive:
-        obj_size = objsize.get_exclusive_deep_size(obj)
-    else:
-        obj_size = objsize.get_deep_size(obj)
+    obj_size = _get_deep_size_up_to(obj, size + 1, exclusive)
 
     if obj_size > size:
-        raise ValueError("{} memory is greater than {}".format(
+        raise ValueError("Size of obj is at least {}, which exceeds the limit of {}".format(
             humanfriendly.format_size(obj_size),
             humanfriendly.format_size(size)))
+
+
+def _get_deep_size_up_to(obj, size, exclusive):
+    """ Get the memory occupied by an object, stopping the traversal of the object
+    once the memory reaches a size
+
+    Args:
+        obj (:obj:`object`): object
+        size (:obj:`int`): size in bytes at which to stop the traversal
+        exclusive (:obj:`bool`): if :obj:`True`, get the exclusive memory of the object
+
+    Returns:
+        :obj:`int`: memory occupied by the object, if it is less than :obj:`size`;
+            otherwise, a size greater than or equal to :obj:`size` which is at most
+            the memory occupied by the object
+    """
+    if exclusive:
+        objs = objsize.traverse_exclusive_bfs(obj)
+    else:
+        objs = objsize.traverse_bfs(obj)
+
+    obj_size = 0
+    for referent in objs:
+        obj_size += sys.getsizeof(referent)
+        if obj_size >= size:
+            break
+    return obj_size
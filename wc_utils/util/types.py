@@ -6,9 +6,13 @@
 :License: MIT
 """
 
+import collections
 import numpy as np
 from wc_utils.util.list import det_dedupe
 
+# builtin scalar types, which are compared by value; :obj:`bytes` is excluded because it is iterable
+_BUILTIN_SCALAR_TYPES = frozenset((bool, complex, float, int, str, type(None)))
+
 
 def cast_to_builtins(obj):
     """ Recursively type cast an object to a semantically equivalent object expressed using only builtin types
@@ -24,27 +28,73 @@ def cast_to_builtins(obj):
         :obj:`object`: a semantically equivalent object expressed using only builtin types
     """
 
+    # dispatch instances of common builtin types by their exact type
+    cast = _CASTS_TO_BUILTINS.get(obj.__class__, None)
+    if cast is not None:
+        return cast(obj)
+
     if isinstance(obj, dict):
-        return dict((key, cast_to_builtins(val)) for key, val in obj.items())
+        return _cast_dict_to_builtins(obj)
 
     elif hasattr(obj, '__dict__'):
-        return dict((key, cast_to_builtins(val)) for key, val in obj.__dict__.items())
+        return _cast_dict_to_builtins(obj.__dict__)
 
     elif hasattr(obj, '__iter__') and not isinstance(obj, str):
-        return [cast_to_builtins(val) for val in obj]
-
-    if isinstance(obj, (np.bool_, np.int_, np.intc, np.intp,
-                        np.int8, np.int16, np.int32, np.int64,
-                        np.uint8, np.uint16, np.uint32, np.uint64,
-                        np.float16, np.float32, np.float64,
-                        np.complex64, np.complex128,
-                        )):
+        return _cast_iterable_to_builtins(obj)
+
+    if isinstance(obj, (np.bool_, np.number)):
         return obj.item()
 
     else:
         return obj
 
 
+def _cast_dict_to_builtins(obj):
+    """ Recursively type cast the values of a dictionary to builtin types
+
+    Args:
+        obj (:obj:`dict`): dictionary
+
+    Returns:
+        :obj:`dict`: dictionary of values expressed using only builtin types
+    """
+    return {key: cast_to_builtins(val) for key, val in obj.items()}
+
+
+def _cast_iterable_to_builtins(obj):
+    """ Recursively type cast the elements of an iterable to builtin types
+
+    Args:
+        obj (:obj:`object`): iterable
+
+    Returns:
+        :obj:`list`: list of elements expressed using only builtin types
+    """
+    return [cast_to_builtins(val) for val in obj]
+
+
+def _cast_builtin_scalar_to_builtins(obj):
+    """ Return a builtin scalar, which is already expressed using a builtin type
+
+    Args:
+        obj (:obj:`object`): builtin scalar
+
+    Returns:
+        :obj:`object`: `obj`
+    """
+    return obj
+
+
+_CASTS_TO_BUILTINS = {
+    dict: _cast_dict_to_builtins,
+    list: _cast_iterable_to_builtins,
+    tuple: _cast_iterable_to_builtins,
+    set: _cast_iterable_to_builtins,
+    frozenset: _cast_iterable_to_builtins,
+}
+_CASTS_TO_BUILTINS.update((scalar_type, _cast_builtin_scalar_to_builtins) for scalar_type in _BUILTIN_SCALAR_TYPES)
+
+
 def assert_value_equal(obj1, obj2, check_type=False, check_iterable_ordering=False):
     """ Recursively raise an exception if two objects have different semantic values, ignoring
 
@@ -107,7 +157,19 @@ def assert_value_equal(obj1, obj2, check_type=False, check_iterable_ordering=Fal
             for val1, val2 in zip(obj1, obj2):
                 assert_value_equal(val1, val2, check_type, check_iterable_ordering)
         else:
-            used2 = []
+            # match iterables of builtin scalars, which are equal if they have the same counts of each
+            # value, by hashing; fall back to pairwise matching if the counts differ (e.g., due to `nan`)
+            if _are_builtin_scalars(obj1) and _are_builtin_scalars(obj2):
+                if check_type:
+                    counts1 = collections.Counter((val.__class__, val) for val in obj1)
+                    counts2 = collections.Counter((val.__class__, val) for val in obj2)
+                else:
+                    counts1 = collections.Counter(obj1)
+                    counts2 = collections.Counter(obj2)
+                if counts1 == counts2:
+                    return
+
+            used2 = set()
             for val1 in obj1:
                 matching_val2 = False
                 for i2, val2 in enumerate(obj2):
@@ -116,7 +178,7 @@ def assert_value_equal(obj1, obj2, check_type=False, check_iterable_ordering=Fal
                     try:
                         assert_value_equal(val1, val2, check_type, check_iterable_ordering)
                         matching_val2 = True
-                        used2.append(i2)
+                        used2.add(i2)
                         break
                     except TypesUtilAssertionError:
                         pass
@@ -124,16 +186,40 @@ def assert_value_equal(obj1, obj2, check_type=False, check_iterable_ordering=Fal
                     raise TypesUtilAssertionError('No equivalent element {} in obj2'.format(val1))
 
     else:
-        try:
-            if np.isnan(obj1) and np.isnan(obj2):
-                return
-        except:
-            pass
-
-        if obj1 != obj2:
+        # `nan` values are considered equal even though they are not equal to themselves
+        if obj1 != obj2 and not (_is_nan(obj1) and _is_nan(obj2)):
             raise TypesUtilAssertionError('Objects have different values')
 
 
+def _is_nan(obj):
+    """ Determine if an object is `nan`
+
+    Args:
+        obj (:obj:`object`): object
+
+    Returns:
+        :obj:`bool`: :obj:`True` if `obj` is `nan`
+    """
+    if isinstance(obj, float):
+        return obj != obj
+    try:
+        return bool(np.isnan(obj))
+    except Exception:
+        return False
+
+
+def _are_builtin_scalars(obj):
+    """ Determine if all of the elements of an iterable are instances of builtin scalar types
+
+    Args:
+        obj (:obj:`object`): iterable
+
+    Returns:
+        :obj:`bool`: :obj:`True` if all of the elements of `obj` are builtin scalars
+    """
+    return all(val.__class__ in _BUILTIN_SCALAR_TYPES for val in obj)
+
+
 def assert_value_not_equal(obj1, obj2, check_type=False, check_iterable_ordering=False):
     """ Recursively raise an exception if two objects have the same semantic values, ignoring
 
@@ -185,32 +271,49 @@ def get_subclasses(cls, immediate_only=False):
     Returns:
         :obj:`list` of `type`: list of subclasses, with duplicates removed
     """
-    subclasses = list(cls.__subclasses__())
-
-    if not immediate_only:
-        for sub_cls in subclasses.copy():
-            subclasses.extend(get_subclasses(sub_cls, immediate_only=False))
+    if immediate_only:
+        subclasses = cls.__subclasses__()
+    else:
+        subclasses = []
+        _append_subclasses(cls, subclasses, set())
 
     return det_dedupe(subclasses)
 
 
+def _append_subclasses(cls, subclasses, expanded):
+    """ Append the direct subclasses of a class, followed by the subclasses of each direct subclass
+
+    The subclasses of each class are only appended once because, in diamond-shaped hierarchies, later
+    repetitions would only contain duplicates.
+
+    Args:
+        cls (:obj:`type`): class
+        subclasses (:obj:`list` of `type`): list to append subclasses to
+        expanded (:obj:`set` of `type`): classes whose subclasses have already been appended
+    """
+    direct_subclasses = cls.__subclasses__()
+    subclasses.extend(direct_subclasses)
+    for sub_cls in direct_subclasses:
+        if sub_cls not in expanded:
+            expanded.add(sub_cls)
+            _append_subclasses(sub_cls, subclasses, expanded)
+
+
 def get_superclasses(cls, immediate_only=False):
     """ Get superclasses of a class. If `immediate_only`, only return direct superclasses.
 
+    Superclasses are returned in method resolution order, without duplicates.
+
     Args:
         cls (:obj:`type`): class
         immediate_only (:obj:`bool`): if true, only return direct superclasses
 
     Returns:
-        :obj:`list` of :obj:`type`: list of superclasses
+        :obj:`tuple` of :obj:`type`: tuple of superclasses
     """
-    superclasses = list(cls.__bases__)
-
-    if not immediate_only:
-        for superclass in cls.__bases__:
-            superclasses += get_superclasses(superclass)
-
-    return tuple(superclasses)
+    if immediate_only:
+        return cls.__bases__
+    return cls.__mro__[1:]
 
 
 class TypesUtilAssertionError(AssertionError):
@@ -8,9 +8,17 @@
 
 from decimal import Decimal, getcontext
 import collections.abc
+import functools
+import numpy
 
 from wc_utils.config.core import get_config
 UNIFORM_SEQ_PRECISION = get_config()['wc_utils']['misc']['uniform_seq_precision']
+# largest integer coefficient of a Decimal with UNIFORM_SEQ_PRECISION digits
+_MAX_EXACT_INT = 10 ** UNIFORM_SEQ_PRECISION - 1
+# largest power of 10 which is exactly represented by a float
+_MAX_EXACT_FLOAT_POWER_OF_10 = 10 ** 22
+# largest integer below which all integers are exactly represented by floats
+_MAX_EXACT_FLOAT_INT = 2 ** 53
 
 
 class UniformSequence(collections.abc.Iterator):
@@ -24,8 +32,17 @@ class UniformSequence(collections.abc.Iterator):
         _start (:obj:`Decimal`): starting point of the sequence
         _step (:obj:`Decimal`): step size for the sequence
         _num_steps (:obj:`int`): number of steps taken in the sequence
+        _exponent (:obj:`int`): power of 10 which scales `_start_int` and `_step_int` to the start and step
+        _start_int (:obj:`int`): starting point of the sequence, divided by 10 ** `_exponent`
+        _step_int (:obj:`int`): step size for the sequence, divided by 10 ** `_exponent`
+        _scale (:obj:`int`): 10 ** abs(`_exponent`)
+        _max_exact_steps (:obj:`int`): number of steps beyond which the Decimal product of the number of
+            steps and the step size may be rounded
     """
 
+    __slots__ = ('_start', '_step', '_num_steps', '_exponent', '_start_int', '_step_int', '_scale',
+                 '_max_exact_steps')
+
     def __init__(self, start, step):
         """ Initialize a :obj:`UniformSequence`
 
@@ -51,6 +68,35 @@ class UniformSequence(collections.abc.Iterator):
                              f"threshold={UNIFORM_SEQ_PRECISION}; provide value as a string to avoid roundoff error")
         self._num_steps = 0
 
+        # represent the start and step as integers with a common power of 10, so that :obj:`next_float` can
+        # compute values exactly with integer arithmetic, while they fit within the Decimal precision
+        if self._start.is_finite():
+            self._exponent = min(self._start.as_tuple().exponent, self._step.as_tuple().exponent)
+            self._start_int = self._scaled_int(self._start, self._exponent)
+            self._step_int = self._scaled_int(self._step, self._exponent)
+            step_coefficient = self._scaled_int(self._step, self._step.as_tuple().exponent)
+            self._max_exact_steps = _MAX_EXACT_INT // abs(step_coefficient)
+        else:
+            self._exponent = 0
+            self._start_int = self._step_int = 0
+            self._max_exact_steps = -1
+        self._scale = 10 ** abs(self._exponent)
+
+    @staticmethod
+    def _scaled_int(value, exponent):
+        """ Get the integer which is equal to a Decimal divided by a power of 10
+
+        Args:
+            value (:obj:`Decimal`): finite value
+            exponent (:obj:`int`): power of 10, which is at most the exponent of `value`
+
+        Returns:
+            :obj:`int`: `value` / 10 ** `exponent`
+        """
+        sign, digits, value_exponent = value.as_tuple()
+        scaled = int(''.join(map(str, digits))) * 10 ** (value_exponent - exponent)
+        return -scaled if sign else scaled
+
     def __iter__(self):
         """ Get this :obj:`UniformSequence`
 
@@ -78,7 +124,47 @@ class UniformSequence(collections.abc.Iterator):
         Returns:
             :obj:`float`: next value in this :obj:`UniformSequence`
         """
-        return float(self.__next__())
+        # if the value and the product of the number of steps and the step size fit within the Decimal
+        # precision, Decimal arithmetic is exact, and the value is computed with integers instead
+        num_steps = self._num_steps
+        numerator = self._start_int + num_steps * self._step_int
+        if self._max_exact_steps < num_steps or not -_MAX_EXACT_INT <= numerator <= _MAX_EXACT_INT:
+            return float(self.__next__())
+        self._num_steps = num_steps + 1
+        if self._exponent < 0:
+            return numerator / self._scale
+        return float(numerator * self._scale)
+
+    def next_floats(self, n):
+        """ Get the next `n` values in the sequence as an array of floats
+
+        The values are the same as those of `n` calls to :obj:`next_float`. When they can be computed
+        exactly, they are computed together with NumPy.
+
+        Args:
+            n (:obj:`int`): number of values
+
+        Returns:
+            :obj:`numpy.ndarray` of :obj:`float`: next `n` values in this :obj:`UniformSequence`
+        """
+        first_step = self._num_steps
+        last_step = first_step + n - 1
+        max_numerator = min(_MAX_EXACT_INT, _MAX_EXACT_FLOAT_INT)
+        if n < 2 or self._max_exact_steps < last_step or _MAX_EXACT_FLOAT_POWER_OF_10 < self._scale or \
+                not -max_numerator <= self._start_int + first_step * self._step_int <= max_numerator or \
+                not -max_numerator <= self._start_int + last_step * self._step_int <= max_numerator:
+            return numpy.array([self.next_float() for _ in range(n)], dtype=numpy.float64)
+
+        # the numerators are linear in the number of steps, so all of them are within the bounds of the first
+        # and last numerators; they are at most 2 ** 53, so they fit in int64s and are exactly represented by
+        # floats, as is the scale
+        numerators = numpy.arange(first_step, last_step + 1, dtype=numpy.int64)
+        numerators *= self._step_int
+        numerators += self._start_int
+        self._num_steps = last_step + 1
+        if self._exponent < 0:
+            return numerators / float(self._scale)
+        return numerators * float(self._scale)
 
     # todo: support scientific notation in truncate() so that sequences like this work
     # ((0, 1E-11), (0, .1E-10, .2E-10, .3E-10, .4E-10, .5E-10, .6E-10, .7E-10, .8E-10, .9E-10)),
@@ -98,9 +184,32 @@ class UniformSequence(collections.abc.Iterator):
         Raises:
             :obj:`StopIteration`: if the truncated value does not equal `value`
         """
-        truncated_value = f'{value:.{UNIFORM_SEQ_PRECISION}f}'
-        if Decimal(truncated_value) != Decimal(str(value)):
-            raise StopIteration(f'UniformSequence: truncation error:\n'
-                                f'value: {value}; truncated_value: {truncated_value} '
-                                f'num digits precision: {UNIFORM_SEQ_PRECISION}; ')
-        return truncated_value
+        # zeros are not cached because 0. and -0. are equal, but are truncated differently
+        if value == 0:
+            return _truncate(value)
+        return _truncate_cached(value)
+
+
+def _truncate(value):
+    """ Truncate a uniform sequence value into fixed-point notation for output
+
+    Args:
+        value (:obj:`float`): value to truncate to a certain precision
+
+    Returns:
+        :obj:`str`: string representation of a uniform sequence value truncated to the maximum
+            precision supported
+
+    Raises:
+        :obj:`StopIteration`: if the truncated value does not equal `value`
+    """
+    truncated_value = f'{value:.{UNIFORM_SEQ_PRECISION}f}'
+    if Decimal(truncated_value) != Decimal(str(value)):
+        raise StopIteration(f'UniformSequence: truncation error:\n'
+                            f'value: {value}; truncated_value: {truncated_value} '
+                            f'num digits precision: {UNIFORM_SEQ_PRECISION}; ')
+    return truncated_value
+
+
+# simulations truncate the same times repeatedly
+_truncate_cached = functools.lru_cache(maxsize=4096, typed=True)(_truncate)
@@ -6,13 +6,18 @@
 :License: MIT
 """
 
+import functools
 import operator
 import os
 import pint
 import pkg_resources
+import sys
 
 DEFAULT_UNIT_DEFINITION_FILENAME = pkg_resources.resource_filename('wc_utils', 'util/units.txt')
 
+# maximum number of parsed expressions which :obj:`are_units_equivalent` caches for each unit registry
+_MAX_PARSED_EXPRESSIONS = 1024
+
 
 def get_unit_registry(base_filename='', extra_filenames=None):
     """ Get a unit registry
@@ -27,15 +32,42 @@ def get_unit_registry(base_filename='', extra_filenames=None):
         :obj:`pint.UnitRegistry`: unit registry
     """
     unit_registry = pint.UnitRegistry(base_filename)
-    extra_filenames = extra_filenames or []
-    for extra_filename in extra_filenames:
-        unit_registry = pint.UnitRegistry()
+    for extra_filename in extra_filenames or []:
         unit_registry.load_definitions(extra_filename)
     return unit_registry
 
 
-unit_registry = get_unit_registry(extra_filenames=[DEFAULT_UNIT_DEFINITION_FILENAME])
-# :obj:`pint.UnitRegistry`: unit registry
+@functools.lru_cache(maxsize=None)
+def _get_default_unit_registry():
+    """ Get the default unit registry, constructing it the first time that it is requested
+
+    Returns:
+        :obj:`pint.UnitRegistry`: unit registry
+    """
+    return get_unit_registry(extra_filenames=[DEFAULT_UNIT_DEFINITION_FILENAME])
+
+
+def __getattr__(name):
+    """ Lazily get the module-level unit registry (:obj:`unit_registry`) so that importing this
+    module doesn't parse the unit definitions (PEP 562)
+
+    Args:
+        name (:obj:`str`): attribute name
+
+    Returns:
+        :obj:`pint.UnitRegistry`: unit registry
+
+    Raises:
+        :obj:`AttributeError`: if the attribute is not :obj:`unit_registry`
+    """
+    if name == 'unit_registry':
+        return _get_default_unit_registry()
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover # module-level `__getattr__` requires Python 3.7
+    unit_registry = _get_default_unit_registry()
+    # :obj:`pint.UnitRegistry`: unit registry
 
 
 def are_units_equivalent(units1, units2, check_same_magnitude=True):
@@ -66,8 +98,12 @@ def are_units_equivalent(units1, units2, check_same_magnitude=True):
             if units1 == units2:
                 return True
 
-            units1_expr = registry.parse_expression(str(units1))
-            units2_expr = registry.parse_expression(str(units2))
+            # units of different dimensionalities are neither equal nor compatible
+            if units1.dimensionality != units2.dimensionality:
+                return False
+
+            units1_expr = _parse_expression(registry, str(units1))
+            units2_expr = _parse_expression(registry, str(units2))
 
             if check_same_magnitude:
                 try:
@@ -77,3 +113,29 @@ def are_units_equivalent(units1, units2, check_same_magnitude=True):
                     return False
             else:
                 return units1_expr.check(units2_expr)
+
+
+def _parse_expression(registry, expression):
+    """ Parse an expression of units, caching the parsed expressions because models
+    typically use a small number of units
+
+    The cache is stored in the registry so that it is freed with the registry. The parsed
+    expressions are shared among callers, and must not be modified.
+
+    Args:
+        registry (:obj:`pint.UnitRegistry`): unit registry
+        expression (:obj:`str`): expression
+
+    Returns:
+        :obj:`pint.quantity._Quantity`: parsed expression
+    """
+    cache = registry.__dict__.get('_parsed_expressions')
+    if cache is None:
+        cache = registry._parsed_expressions = {}
+
+    parsed = cache.get(expression)
+    if parsed is None:
+        if len(cache) >= _MAX_PARSED_EXPRESSIONS:
+            cache.clear()
+        parsed = cache[expression] = registry.parse_expression(expression)
+    return parsed
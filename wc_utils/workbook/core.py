@@ -8,6 +8,8 @@
 
 from openpyxl.utils import get_column_letter
 import collections
+import itertools
+import operator
 
 
 class Workbook(collections.OrderedDict):
@@ -25,11 +27,12 @@ class Workbook(collections.OrderedDict):
         if other.__class__ is not self.__class__:
             return False
 
-        if set(self.keys()) != set(other.keys()):
+        # workbooks of the same size whose sheets are all in the other workbook have the same sheet names
+        if len(self) != len(other):
             return False
 
         for name, sheet in self.items():
-            if not sheet == other[name]:
+            if name not in other or not sheet == other[name]:
                 return False
 
         return True
@@ -70,7 +73,7 @@ class Workbook(collections.OrderedDict):
             else:
                 diff[name] = 'Sheet not in other'
 
-        for name in other.keys():
+        for name in other:
             if name not in self:
                 diff[name] = 'Sheet not in self'
 
@@ -110,11 +113,9 @@ class Worksheet(list):
         if len(self) != len(other):
             return False
 
-        for row_self, row_other in zip(self, other):
-            if not row_self == row_other:
-                return False
-
-        return True
+        # compare the rows in C; unlike list equality, :obj:`operator.eq` doesn't treat identical rows as
+        # equal without calling :obj:`Row.__eq__`
+        return all(map(operator.eq, self, other))
 
     def __ne__(self, other):
         """ Compare two worksheets
@@ -170,13 +171,15 @@ class Worksheet(list):
         """ Remove empty final columns """
         max_col = 0
         for row in self:
-            for i_rev_col, cell in enumerate(reversed(row)):
+            # only the cells to the right of the last non-empty column found so far can extend it
+            for i_rev_col, cell in enumerate(itertools.islice(reversed(row), max(len(row) - max_col, 0))):
                 if cell not in (None, ''):
-                    max_col = max(max_col, len(row) - i_rev_col)
+                    max_col = len(row) - i_rev_col
                     break
 
         for i_row, row in enumerate(self):
-            self[i_row] = row[0:max_col]
+            if len(row) > max_col:
+                self[i_row] = row[0:max_col]
 
 
 class Row(list):
@@ -212,6 +215,12 @@ class Row(list):
         if len(self) != len(other):
             return False
 
+        # most equal rows have equal cells, which can be compared in C; only compare the cells individually
+        # to treat `None` and empty strings as equal. Unlike list equality, :obj:`operator.eq` doesn't treat
+        # identical cells, such as a `nan`, as equal.
+        if all(map(operator.eq, self, other)):
+            return True
+
         for c_self, c_other in zip(self, other):
             if not (c_self == c_other or (c_self is None and c_other == '') or (c_self == '' and c_other is None)):
                 return False
@@ -247,13 +256,15 @@ class Row(list):
 
         diff = RowDifference()
 
-        for i_cell, cell_self in enumerate(self):
-            if i_cell < len(other):
-                diff_cell = self.cell_difference(cell_self, other[i_cell])
+        for i_cell, (cell_self, cell_other) in enumerate(zip(self, other)):
+            # most cells are equal; only compute the differences of the other cells
+            if not cell_self == cell_other:
+                diff_cell = self.cell_difference(cell_self, cell_other)
                 if diff_cell:
                     diff[i_cell] = diff_cell
-            else:
-                diff[i_cell] = 'Cell not in other'
+
+        for i_cell in range(len(other), len(self)):
+            diff[i_cell] = 'Cell not in other'
 
         for i_cell in range(len(self), len(other)):
             diff[i_cell] = 'Cell not in self'
@@ -313,12 +324,8 @@ class WorkbookDifference(dict):
         Returns:
             :obj:`str`: string representation
         """
-        diff = ''
-
-        for name, sheet in self.items():
-            diff += '\nSheet {}:\n  {}'.format(name, str(sheet).replace('\n', '\n  '))
-
-        return diff[1:]
+        return '\n'.join('Sheet {}:\n  {}'.format(name, str(sheet).replace('\n', '\n  '))
+                         for name, sheet in self.items())
 
 
 class WorksheetDifference(collections.OrderedDict):
@@ -330,12 +337,8 @@ class WorksheetDifference(collections.OrderedDict):
         Returns:
             :obj:`str`: string representation
         """
-        diff = ''
-
-        for i_row, row in self.items():
-            diff += '\nRow {}:\n  {}'.format(i_row + 1, str(row).replace('\n', '\n  '))
-
-        return diff[1:]
+        return '\n'.join('Row {}:\n  {}'.format(i_row + 1, str(row).replace('\n', '\n  '))
+                         for i_row, row in self.items())
 
 
 class RowDifference(collections.OrderedDict):
@@ -347,14 +350,10 @@ class RowDifference(collections.OrderedDict):
         Returns:
             :obj:`str`: string representation
         """
-        diff = ''
-
-        for i_col, cell_diff in self.items():
-            diff += '\nCell {}: {}'.format(get_column_letter(i_col + 1), cell_diff.replace('\n', '\n  '))
-
-        return diff[1:]
+        return '\n'.join('Cell {}: {}'.format(get_column_letter(i_col + 1), cell_diff.replace('\n', '\n  '))
+                         for i_col, cell_diff in self.items())
 
 
 class CellDifference(str):
     """ Difference between values of cells """
-    pass
+    __slots__ = ()